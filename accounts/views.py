@@ -1,7 +1,9 @@
 from django.shortcuts import render, redirect
 from accounts.forms import CustomUserCreationForm
+from blogger.routers import sticky_writes
 
 
+@sticky_writes
 def signup(request):
     form = CustomUserCreationForm()
     if request.method == "POST":
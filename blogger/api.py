@@ -0,0 +1,168 @@
+from functools import wraps
+
+from django.db.models import Count
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_safe
+from blogger import permalinks
+from blogger.models import Post, Author, Comment
+from blogger.page_cache import cache_anonymous_page
+from blogger.pagination import CursorPaginator, InvalidCursor, encode_cursor
+from blogger.routers import read_from_replica
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Public field name -> lookup passed to values_list(). Rows are turned into
+# dicts directly, without building model instances.
+POST_FIELDS = {
+    "id": "id",
+    "slug": "title_slug",
+    "title": "title",
+    "author": "author__username",
+    "created": "created",
+    "modified": "modified",
+    "excerpt": "excerpt",
+    "word_count": "word_count",
+    "comment_count": "comment_count",
+    "last_commented_at": "last_commented_at",
+    "content": "content",
+}
+POST_LIST_FIELDS = [name for name in POST_FIELDS if name != "content"]
+
+COMMENT_FIELDS = {
+    "id": "id",
+    "author": "author__username",
+    "created": "created",
+    "text": "comment_text",
+}
+
+AUTHOR_FIELDS = {
+    "username": "username",
+    "date_joined": "user__date_joined",
+    "post_count": "post_count",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def api_view(view_func):
+    """
+    Serve the dict a view returns as JSON, and ApiError and Http404 as JSON
+    errors. Only GET and HEAD are allowed.
+    """
+
+    @require_safe
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            data = view_func(request, *args, **kwargs)
+        except ApiError as e:
+            return JsonResponse({"error": e.message}, status=e.status)
+        except Http404:
+            return JsonResponse({"error": "Not found"}, status=404)
+        return JsonResponse(data)
+
+    return wrapper
+
+
+def requested_fields(request, available, default):
+    if not request.GET.get("fields"):
+        return default
+    fields = [name for name in request.GET["fields"].split(",") if name]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ApiError(400, f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def requested_limit(request):
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError(400, "limit must be a number")
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def cursor_page(request, queryset, available, default, descending=True):
+    """
+    One page of ``queryset`` keyset-paginated on (created, id), with a
+    ``next`` URL carrying the cursor of its last row.
+    """
+    fields = requested_fields(request, available, default)
+    limit = requested_limit(request)
+    # created and id always come last; the cursor is built from them.
+    lookups = [available[name] for name in fields] + ["created", "id"]
+    paginator = CursorPaginator(queryset.values_list(*lookups), limit, descending)
+
+    position = None
+    if request.GET.get("after"):
+        try:
+            position = paginator.position_for(request.GET["after"])
+        except InvalidCursor:
+            raise ApiError(400, "Invalid cursor")
+
+    rows = list(paginator.page_queryset(position))
+    next_url = None
+    if len(rows) > limit:
+        created, pk = rows[limit - 1][-2:]
+        query = request.GET.copy()
+        query["after"] = encode_cursor(created.isoformat(), pk)
+        next_url = request.build_absolute_uri("?" + query.urlencode())
+    return {
+        "results": [dict(zip(fields, row)) for row in rows[:limit]],
+        "next": next_url,
+    }
+
+
+def single_row(request, queryset, available):
+    fields = requested_fields(request, available, list(available))
+    row = queryset.values_list(*[available[name] for name in fields]).first()
+    if row is None:
+        raise Http404
+    return dict(zip(fields, row))
+
+
+@read_from_replica
+@cache_anonymous_page("feed")
+@api_view
+def posts(request):
+    queryset = Post.objects.all()
+    if request.GET.get("author"):
+        queryset = queryset.by_author(request.GET["author"])
+    return cursor_page(request, queryset, POST_FIELDS, POST_LIST_FIELDS)
+
+
+@read_from_replica
+@cache_anonymous_page("post")
+@api_view
+def post(request, title):
+    return single_row(request, Post.objects.filter(title_slug=title), POST_FIELDS)
+
+
+@read_from_replica
+@cache_anonymous_page("post")
+@api_view
+def comments(request, title):
+    permalink = permalinks.resolve(title)
+    return cursor_page(
+        request,
+        Comment.objects.filter(post_id=permalink.post_id),
+        COMMENT_FIELDS,
+        list(COMMENT_FIELDS),
+        descending=False,
+    )
+
+
+@read_from_replica
+@cache_anonymous_page("author")
+@api_view
+def author(request, username):
+    queryset = Author.objects.filter(username=username).annotate(
+        post_count=Count("post")
+    )
+    return single_row(request, queryset, AUTHOR_FIELDS)
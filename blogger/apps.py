@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class BloggerConfig(AppConfig):
     name = 'blogger'
+
+    def ready(self):
+        from blogger import sqlite
+
+        connection_created.connect(sqlite.apply_pragmas)
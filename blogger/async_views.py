@@ -0,0 +1,96 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.shortcuts import get_object_or_404, render
+from blogger import conditional
+from blogger.middleware import record_queries
+from blogger.models import Post, Author, Comment
+from blogger.page_cache import cache_anonymous_page
+from blogger.pagination import paginate, paginate_comments
+from blogger.routers import read_from_replica
+
+# Async versions of the read-only views in blogger.views, served instead of
+# them when BLOGGER_ASYNC_VIEWS is set. They only pay off under ASGI: the
+# event loop is never blocked on the database, and the independent queries
+# of a page run at the same time.
+
+
+def _query(func, *args, **kwargs):
+    """
+    Run func in a worker thread of its own, so that several calls can be in
+    flight at once. Each worker thread has its own database connection,
+    which is cleaned up around the call like a request's connection is.
+    """
+
+    def run():
+        close_old_connections()
+        try:
+            with record_queries():
+                return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)()
+
+
+def _page(request, queryset):
+    page = paginate(request, queryset)
+    page.object_list = list(page.object_list)
+    return page
+
+
+def _render(request, template_name, context):
+    return sync_to_async(render)(request, template_name, context)
+
+
+@read_from_replica
+@cache_anonymous_page("feed")
+async def index(request):
+    page_obj = await _query(_page, request, Post.objects.for_listing())
+    return await _render(request, "blogger/index.html", {"page_obj": page_obj})
+
+
+@read_from_replica
+@conditional.async_condition(
+    etag_func=conditional.post_etag, last_modified_func=conditional.post_last_modified
+)
+@cache_anonymous_page("post")
+async def view_post(request, title):
+    post, comments = await asyncio.gather(
+        _query(
+            get_object_or_404,
+            Post.objects.select_related("author"),
+            title_slug=title,
+        ),
+        _query(
+            paginate_comments,
+            request,
+            Comment.objects.filter(post__title_slug=title).select_related("author"),
+        ),
+    )
+    return await _render(
+        request, "blogger/view_post.html", {"post": post, "comments": comments}
+    )
+
+
+@read_from_replica
+@conditional.async_condition(
+    etag_func=conditional.author_etag,
+    last_modified_func=conditional.author_last_modified,
+)
+@cache_anonymous_page("author")
+async def view_blogger(request, username):
+    author, posts = await asyncio.gather(
+        _query(Author.objects.filter(username=username).first),
+        _query(
+            _page,
+            request,
+            Post.objects.for_listing().by_author(username),
+        ),
+    )
+    if author is None:
+        posts = None
+    return await _render(
+        request, "blogger/view_blogger.html", {"author": author, "posts": posts}
+    )
@@ -0,0 +1,302 @@
+import asyncio
+import copy
+import importlib
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.template import engines
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import clear_url_caches, reverse
+from accounts import urls as account_urls
+from blogger import urls as blogger_urls
+from blogger import warmup
+from blogger.models import Post
+
+
+class Scenario:
+    def __init__(self, name, path, method="get", data=None, user=None):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.data = data
+        self.user = user
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, queries, statuses, elapsed):
+    ordered = sorted(latencies)
+    count = len(ordered)
+    summary = {
+        "requests": count,
+        "errors": sum(n for status, n in statuses.items() if status >= 400),
+        "status_codes": {str(status): n for status, n in sorted(statuses.items())},
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+    if queries is not None:
+        summary["queries_mean"] = round(sum(queries) / count, 2) if count else 0.0
+        summary["queries_max"] = max(queries, default=0)
+    return summary
+
+
+def build_scenarios():
+    """
+    One scenario per named URL in blogger.urls and accounts.urls, aimed at
+    the newest post and its author, who is also the logged-in user for the
+    views that need one.
+    """
+    post = Post.objects.select_related("author__user").first()
+    user = post.author.user
+    slug = post.title_slug
+
+    arguments = {
+        "view_post": (slug,),
+        "edit_post": (slug,),
+        "delete_post": (slug,),
+        "add_comment": (slug,),
+        "comments": (slug,),
+        "view_blogger": (user.username,),
+        "author_feed": (user.username,),
+        "api_post": (slug,),
+        "api_comments": (slug,),
+        "api_author": (user.username,),
+    }
+    query_strings = {"search": "?q=lorem"}
+    logged_in = {"add_post", "edit_post", "delete_post", "add_comment"}
+
+    scenarios = []
+    for namespace, patterns in (
+        ("blogger:", blogger_urls.urlpatterns),
+        ("", account_urls.urlpatterns),
+    ):
+        for pattern in patterns:
+            name = pattern.name
+            path = reverse(namespace + name, args=arguments.get(name, ()))
+            path += query_strings.get(name, "")
+            scenarios.append(
+                Scenario(name, path, user=user if name in logged_in else None)
+            )
+
+    scenarios.append(Scenario("index_page_2", reverse("blogger:index") + "?page=2"))
+    scenarios.append(
+        Scenario(
+            "api_posts_sparse", reverse("blogger:api_posts") + "?fields=slug,title"
+        )
+    )
+    scenarios.append(
+        Scenario(
+            "add_comment_post",
+            reverse("blogger:add_comment", args=(slug,)),
+            method="post",
+            data={"comment_text": "benchmark comment"},
+            user=user,
+        )
+    )
+    return scenarios
+
+
+def _run(pick, requests, concurrency):
+    """
+    Send ``requests`` requests from ``concurrency`` threads, request ``i``
+    being for the scenario ``pick(i)``.
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    latencies, queries, statuses = [], [], Counter()
+
+    def client(user):
+        clients = local.__dict__.setdefault("clients", {})
+        if user not in clients:
+            clients[user] = Client()
+            if user is not None:
+                clients[user].force_login(user)
+        return clients[user]
+
+    def one_request(i):
+        scenario = pick(i)
+        request = getattr(client(scenario.user), scenario.method)
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = request(scenario.path, scenario.data)
+            latency = time.perf_counter() - start
+        # The test client keeps connections open; do what the request
+        # handler does at the end of a request, so CONN_MAX_AGE applies.
+        close_old_connections()
+        with lock:
+            latencies.append(latency)
+            queries.append(len(captured))
+            statuses[response.status_code] += 1
+
+    # Warm up templates, URL resolvers and the logged-in session first.
+    one_request(0)
+    latencies.clear()
+    queries.clear()
+    statuses.clear()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one_request, range(requests)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, queries, statuses, elapsed)
+
+
+def run_scenario(scenario, requests, concurrency):
+    return _run(lambda i: scenario, requests, concurrency)
+
+
+MIXED_READS = ("index", "view_post", "view_blogger", "feed", "api_posts")
+MIXED_WRITE = "add_comment_post"
+
+
+def run_mixed(scenarios, requests, concurrency, write_fraction=0.2):
+    """
+    Interleave comment posts with reads of the pages they invalidate; one
+    request in every 1 / ``write_fraction`` is a write.
+    """
+    by_name = {scenario.name: scenario for scenario in scenarios}
+    reads = [by_name[name] for name in MIXED_READS]
+    write = by_name[MIXED_WRITE]
+    every = max(1, round(1 / write_fraction)) if write_fraction else None
+
+    def pick(i):
+        if every and i % every == every - 1:
+            return write
+        return reads[i % len(reads)]
+
+    return _run(pick, requests, concurrency)
+
+
+ASYNC_SCENARIOS = {"index", "index_page_2", "view_post", "view_blogger"}
+
+
+@contextmanager
+def async_views():
+    """Route the read views to blogger.async_views while inside the block."""
+
+    def reload_urls():
+        # The project URLconf holds on to the resolver of the included
+        # blogger.urls, so it has to be rebuilt as well.
+        importlib.reload(blogger_urls)
+        importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+        clear_url_caches()
+
+    try:
+        with override_settings(BLOGGER_ASYNC_VIEWS=True):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
+def run_scenario_async(scenario, requests, concurrency):
+    """
+    Like run_scenario(), but through Django's ASGI handler with
+    ``concurrency`` requests in flight on one event loop. Queries run on
+    worker threads there, so they are not counted.
+    """
+    latencies, statuses = [], Counter()
+    clients = [AsyncClient() for _ in range(concurrency)]
+    if scenario.user is not None:
+        for client in clients:
+            client.force_login(scenario.user)
+
+    async def one_request(client):
+        request = getattr(client, scenario.method)
+        start = time.perf_counter()
+        response = await request(scenario.path, scenario.data)
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status_code] += 1
+
+    async def worker(client, count):
+        for _ in range(count):
+            await one_request(client)
+
+    async def run():
+        await one_request(clients[0])
+        latencies.clear()
+        statuses.clear()
+        shares = [requests // concurrency] * concurrency
+        for i in range(requests % concurrency):
+            shares[i] += 1
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(client, share) for client, share in zip(clients, shares))
+        )
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    return summarize(latencies, None, statuses, elapsed)
+
+
+def template_settings(mode):
+    """TEMPLATES as BLOGGER_TEMPLATE_MODE = ``mode`` would set it."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    loaders = settings.TEMPLATE_SOURCE_LOADERS
+    if mode == "production":
+        loaders = [("django.template.loaders.cached.Loader", loaders)]
+    templates[0]["OPTIONS"]["loaders"] = loaders
+    return templates
+
+
+FIRST_REQUEST_SCENARIOS = (
+    "index",
+    "view_post",
+    "view_blogger",
+    "add_post",
+    "signup",
+)
+
+
+def _forget_compiled():
+    # What a freshly started worker has: no compiled templates and no URL
+    # resolvers. Python modules stay imported, so their cost isn't measured.
+    for backend in engines.all():
+        for loader in backend.engine.template_loaders:
+            if hasattr(loader, "reset"):
+                loader.reset()
+    clear_url_caches()
+
+
+def first_request_latency(scenarios, warm, rounds=5):
+    """
+    The median latency, over ``rounds`` tries, of the first request to each
+    of FIRST_REQUEST_SCENARIOS in a worker starting from scratch, after
+    warmup.run() if ``warm``.
+    """
+    by_name = {scenario.name: scenario for scenario in scenarios}
+    report = {}
+    for name in FIRST_REQUEST_SCENARIOS:
+        scenario = by_name[name]
+        client = Client()
+        if scenario.user is not None:
+            client.force_login(scenario.user)
+        latencies, statuses = [], Counter()
+        for _ in range(rounds):
+            _forget_compiled()
+            if warm:
+                warmup.run()
+            request = getattr(client, scenario.method)
+            start = time.perf_counter()
+            response = request(scenario.path, scenario.data)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+        report[name] = {
+            "status_codes": {str(status): n for status, n in statuses.items()},
+            "p50_ms": round(percentile(sorted(latencies), 0.5) * 1000, 3),
+        }
+    return report
@@ -0,0 +1,169 @@
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from blogger import feeds
+from blogger.models import Post, Author
+
+
+def _once_per_request(func):
+    """
+    condition() calls the etag and last-modified functions separately; share
+    one validator query between them.
+    """
+
+    @wraps(func)
+    def wrapper(request, *args):
+        memo = request.__dict__.setdefault("_blogger_validators", {})
+        key = (func.__name__,) + args
+        if key not in memo:
+            memo[key] = func(request, *args)
+        return memo[key]
+
+    return wrapper
+
+
+def _etag(request, *parts):
+    raw = "|".join(str(part) for part in parts + (request.user.pk,))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+@_once_per_request
+def post_state(request, title):
+    return (
+        Post.objects.filter(title_slug=title)
+        .values_list(
+            "modified", "last_commented_at", "comment_count", "author__username"
+        )
+        .first()
+    )
+
+
+def post_last_modified(request, title):
+    state = post_state(request, title)
+    if state is None:
+        return None
+    modified, last_commented_at, _, _ = state
+    return max(modified, last_commented_at or modified)
+
+
+def post_etag(request, title):
+    state = post_state(request, title)
+    if state is None:
+        return None
+    return _etag(request, *state)
+
+
+@_once_per_request
+def author_state(request, username):
+    """
+    The author's post stats, or None if there is no such author, so that
+    the "No Author Found" page gets no validators and is never answered
+    with a 304 once someone signs up under the name.
+    """
+    state = Author.objects.filter(username=username).aggregate(
+        authors=Count("id", distinct=True),
+        posts=Count("post"),
+        modified=Max("post__modified"),
+        comments=Sum("post__comment_count"),
+        last_commented_at=Max("post__last_commented_at"),
+    )
+    if not state["authors"]:
+        return None
+    return state
+
+
+def author_last_modified(request, username):
+    state = author_state(request, username)
+    if state is None or state["modified"] is None:
+        return None
+    return max(state["modified"], state["last_commented_at"] or state["modified"])
+
+
+def author_etag(request, username):
+    state = author_state(request, username)
+    if state is None:
+        return None
+    return _etag(
+        request,
+        state["posts"],
+        state["modified"],
+        state["comments"],
+        state["last_commented_at"],
+    )
+
+
+@_once_per_request
+def feed_state(request, username=None):
+    """
+    The (id, modified, author's username) of the feed's posts, or None for
+    the feed of an author that doesn't exist, so that it gets no validators
+    and its 404 is never answered with a 304.
+    """
+    state = list(
+        feeds.latest_posts(
+            Post.objects.values_list("id", "modified", "author__username"), username
+        )
+    )
+    if username is not None and not state:
+        if not Author.objects.filter(username=username).exists():
+            return None
+    return state
+
+
+def feed_last_modified(request, username=None):
+    state = feed_state(request, username)
+    if state is None:
+        return None
+    return max((modified for _, modified, _ in state), default=None)
+
+
+def feed_etag(request, username=None):
+    # The same for every user, unlike the page ETags: feeds have no
+    # per-user content.
+    state = feed_state(request, username)
+    if state is None:
+        return None
+    raw = "|".join([feeds.get_format(request)] + [f"{i}:{m}:{a}" for i, m, a in state])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def async_condition(etag_func, last_modified_func):
+    """
+    django.views.decorators.http.condition() for async views. The validator
+    queries run in a thread, the view itself on the event loop.
+    """
+
+    def validators(request, *args, **kwargs):
+        etag = etag_func(request, *args, **kwargs)
+        last_modified = last_modified_func(request, *args, **kwargs)
+        return (
+            quote_etag(etag) if etag is not None else None,
+            timegm(last_modified.utctimetuple()) if last_modified else None,
+        )
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(validators)(
+                request, *args, **kwargs
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.setdefault("ETag", etag)
+            return response
+
+        return inner
+
+    return decorator
@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+ITEMS_MARKER = "\x00items\x00"
+
+
+def get_length():
+    return getattr(settings, "BLOGGER_FEED_LENGTH", 20)
+
+
+def latest_posts(posts, username=None):
+    """
+    The newest of ``posts``, site-wide or of one author, read from the
+    (created, id) and (author, created, id) indexes.
+    """
+    if username is not None:
+        posts = posts.by_author(username)
+    return posts.order_by("-created", "-id")[: get_length()]
+
+
+class StreamingFeedMixin:
+    """
+    Writes a feed as it is read: the header up to the first item, one chunk
+    per item, then the closing tags. Items are never held in memory all at
+    once.
+    """
+
+    item_element = None
+
+    def write_items(self, handler):
+        handler.ignorableWhitespace(ITEMS_MARKER)
+
+    def latest_post_date(self):
+        return self.feed.get("updated") or super().latest_post_date()
+
+    def stream(self, items, encoding="utf-8"):
+        head, tail = self.writeString(encoding).split(ITEMS_MARKER)
+        yield head
+        for item in items:
+            self.add_item(**item)
+            item = self.items.pop()
+            chunk = StringIO()
+            handler = SimplerXMLGenerator(chunk, encoding)
+            handler.startElement(self.item_element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield chunk.getvalue()
+        yield tail
+
+
+class AtomFeed(StreamingFeedMixin, Atom1Feed):
+    item_element = "entry"
+
+
+class RssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    item_element = "item"
+
+
+FORMATS = {"atom": AtomFeed, "rss": RssFeed}
+
+
+def get_format(request):
+    return request.GET.get("format") if request.GET.get("format") in FORMATS else "atom"
+
+
+def _items(request, posts):
+    for post in posts:
+        link = request.build_absolute_uri(post.get_absolute_url())
+        yield {
+            "title": post.title,
+            "link": link,
+            "description": post.excerpt,
+            "author_name": post.author_username,
+            "pubdate": post.created,
+            "updateddate": post.modified,
+            "unique_id": link,
+        }
+
+
+def feed_response(request, title, link, posts, updated):
+    feed = FORMATS[get_format(request)](
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=title,
+        feed_url=request.build_absolute_uri(),
+        updated=updated,
+    )
+    return StreamingHttpResponse(
+        feed.stream(_items(request, posts.iterator())),
+        content_type=feed.content_type,
+    )
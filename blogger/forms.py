@@ -1,4 +1,5 @@
 from django import forms
+from blogger import ingest
 from blogger.models import Post, Comment
 
 
@@ -30,6 +31,7 @@ class CommentModelForm(forms.ModelForm):
         fields = ("comment_text",)
 
     def save(self, post, author):
-        return Comment.objects.create(
+        comment = Comment(
             comment_text=self.cleaned_data["comment_text"], post=post, author=author
         )
+        return ingest.save_comment(comment)
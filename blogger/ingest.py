@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger("blogger.ingest")
+
+_STOP = object()
+
+
+def get_mode():
+    return getattr(settings, "BLOGGER_COMMENT_INGEST", "direct")
+
+
+class _Pending:
+    def __init__(self, comment):
+        self.comment = comment
+        self.future = Future()
+        self.submitted = time.monotonic()
+
+
+class CommentBatcher:
+    """
+    Saves comments from many request threads in a few grouped transactions.
+
+    Submitted comments are queued; a single writer thread takes the first one
+    waiting, gathers whatever else arrives within ``delay`` seconds (up to
+    ``batch_size`` comments) and saves them all in one transaction, so a
+    burst costs one commit and one acquisition of SQLite's write lock instead
+    of one per comment.
+
+    Durability: submit() only returns once the transaction holding the
+    comment has committed, and raises if it could not be saved, so a comment
+    the user was told about is never lost. Comments still queued when the
+    process dies were never acknowledged; their requests die with it. The
+    price is up to ``delay`` seconds of extra latency per comment.
+    """
+
+    def __init__(self, delay=0.01, batch_size=100):
+        self.delay = delay
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.batches = 0
+        self.comments = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def submit(self, comment, timeout=None):
+        pending = _Pending(comment)
+        self._ensure_started()
+        self._queue.put(pending)
+        return pending.future.result(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self.batches,
+                "comments": self.comments,
+                "failures": self.failures,
+                "last_flush_ms": self.last_flush_ms,
+                "max_flush_ms": self.max_flush_ms,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="blogger-comment-ingest", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                first = self._queue.get()
+                if first is _STOP:
+                    return
+                batch = [first]
+                deadline = first.submitted + self.delay
+                stop = False
+                while len(batch) < self.batch_size:
+                    try:
+                        pending = self._queue.get(
+                            timeout=max(0, deadline - time.monotonic())
+                        )
+                    except queue.Empty:
+                        break
+                    if pending is _STOP:
+                        stop = True
+                        break
+                    batch.append(pending)
+                self._flush(batch)
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _flush(self, batch):
+        close_old_connections()
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                for pending in batch:
+                    pending.comment.save()
+        except Exception:
+            # One bad comment (its post was just deleted, say) rolls back the
+            # whole group; retry one at a time so only that comment fails.
+            for pending in batch:
+                pending.comment.pk = None
+                pending.comment._state.adding = True
+            self._save_each(batch)
+        else:
+            for pending in batch:
+                pending.future.set_result(pending.comment)
+        self._record(batch, time.perf_counter() - start)
+
+    def _save_each(self, batch):
+        for pending in batch:
+            try:
+                pending.comment.save()
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                pending.future.set_exception(e)
+            else:
+                pending.future.set_result(pending.comment)
+
+    def _record(self, batch, duration):
+        now = time.monotonic()
+        flush_ms = round(duration * 1000, 3)
+        wait_ms = round((now - batch[0].submitted) * 1000, 3)
+        with self._lock:
+            self.batches += 1
+            self.comments += len(batch)
+            self.last_flush_ms = flush_ms
+            self.max_flush_ms = max(self.max_flush_ms, flush_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        logger.info(
+            json.dumps(
+                {
+                    "batch": len(batch),
+                    "queue_depth": self._queue.qsize(),
+                    "flush_ms": flush_ms,
+                    "wait_ms": wait_ms,
+                }
+            )
+        )
+
+
+_batcher = None
+_batcher_pid = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    """
+    The process's CommentBatcher. A forked worker gets its own, since the
+    writer thread does not survive a fork.
+    """
+    global _batcher, _batcher_pid
+    with _batcher_lock:
+        if _batcher is None or _batcher_pid != os.getpid():
+            _batcher = CommentBatcher(
+                delay=getattr(settings, "BLOGGER_COMMENT_INGEST_DELAY", 0.01),
+                batch_size=getattr(settings, "BLOGGER_COMMENT_INGEST_BATCH_SIZE", 100),
+            )
+            _batcher_pid = os.getpid()
+        return _batcher
+
+
+def save_comment(comment):
+    """
+    Save a new comment, through the CommentBatcher when
+    BLOGGER_COMMENT_INGEST is "grouped".
+
+    Return the comment once it is committed, or None if it is still queued
+    after BLOGGER_COMMENT_INGEST_TIMEOUT seconds: it was accepted and the
+    writer thread will commit it, so saving it again would duplicate it.
+    """
+    # Inside a transaction the writer thread could not see the caller's
+    # uncommitted rows, and would wait on its write lock; save directly.
+    if get_mode() == "grouped" and not connection.in_atomic_block:
+        timeout = getattr(settings, "BLOGGER_COMMENT_INGEST_TIMEOUT", 10)
+        try:
+            return get_batcher().submit(comment, timeout=timeout)
+        except TimeoutError:
+            logger.warning(
+                json.dumps(
+                    {"pending": True, "timeout_s": timeout, "post": comment.post_id}
+                )
+            )
+            return None
+    comment.save()
+    return comment
+
+
+def stats():
+    return dict(get_batcher().stats(), mode=get_mode())
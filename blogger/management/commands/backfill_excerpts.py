@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from blogger.models import Post, summarize
+
+
+class Command(BaseCommand):
+    help = "Compute Post.excerpt and Post.word_count for existing posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of posts loaded and updated per transaction.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every post, not only those without a word count.",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by("id").only("id", "content")
+        if not options["all"]:
+            posts = posts.filter(word_count=0)
+
+        total = 0
+        last_id = 0
+        while True:
+            batch = list(posts.filter(id__gt=last_id)[: options["batch_size"]])
+            if not batch:
+                break
+            for post in batch:
+                post.excerpt, post.word_count = summarize(post.content)
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ["excerpt", "word_count"])
+            total += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"Summarized {total} posts"))
@@ -0,0 +1,203 @@
+import json
+import os
+import shutil
+import tempfile
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from blogger import bench, ingest, sqlite
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and report latency, throughput and query "
+        "counts for every blogger and accounts URL as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--authors", type=int, default=20)
+        parser.add_argument("--posts-per-author", type=int, default=50)
+        parser.add_argument("--comments-per-post", type=int, default=20)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument(
+            "--no-page-cache",
+            action="store_true",
+            help="Disable the anonymous page cache while measuring.",
+        )
+        parser.add_argument(
+            "--comment-ingest",
+            choices=("direct", "grouped"),
+            default="direct",
+            help="How add_comment saves comments (see BLOGGER_COMMENT_INGEST).",
+        )
+        parser.add_argument(
+            "--sqlite-profile",
+            choices=sorted(sqlite.PROFILES),
+            help=(
+                "SQLite PRAGMA profile to measure with; defaults to "
+                'BLOGGER_SQLITE_PROFILE. "production" also keeps connections '
+                "open between requests."
+            ),
+        )
+        parser.add_argument(
+            "--write-fraction",
+            type=float,
+            default=0.2,
+            help="Share of comment posts in the mixed read/write scenario.",
+        )
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help=(
+                "Also measure the feed, post and author pages through the ASGI "
+                "handler with the async views."
+            ),
+        )
+        parser.add_argument(
+            "--template-mode",
+            choices=("debug", "production"),
+            help=(
+                "Template loading to measure with; defaults to "
+                "BLOGGER_TEMPLATE_MODE."
+            ),
+        )
+        parser.add_argument(
+            "--first-request",
+            action="store_true",
+            help=(
+                "Also measure the first request to a few pages in a worker "
+                "that has compiled nothing yet, with and without warm-up."
+            ),
+        )
+        parser.add_argument(
+            "--output", help="Write the report to this file instead of stdout."
+        )
+
+    def _seed(self, options):
+        call_command(
+            "populate_db",
+            authors=options["authors"],
+            posts_per_author=options["posts_per_author"],
+            comments_per_post=options["comments_per_post"],
+            batch_size=5000,
+            stdout=self.stderr,
+        )
+
+    def _measure(self, options):
+        report = {}
+        scenarios = bench.build_scenarios()
+        for scenario in scenarios:
+            self.stderr.write(f"benchmarking {scenario.name}")
+            report[scenario.name] = bench.run_scenario(
+                scenario, options["requests"], options["concurrency"]
+            )
+        self.stderr.write("benchmarking mixed read/write")
+        report["mixed_read_write"] = bench.run_mixed(
+            scenarios,
+            options["requests"],
+            options["concurrency"],
+            options["write_fraction"],
+        )
+        return report
+
+    def _measure_asgi(self, options):
+        report = {}
+        with bench.async_views():
+            for scenario in bench.build_scenarios():
+                if scenario.name not in bench.ASYNC_SCENARIOS:
+                    continue
+                self.stderr.write(f"benchmarking {scenario.name} (asgi)")
+                report[scenario.name] = bench.run_scenario_async(
+                    scenario, options["requests"], options["concurrency"]
+                )
+        return report
+
+    def _measure_first_request(self):
+        self.stderr.write("benchmarking first requests")
+        scenarios = bench.build_scenarios()
+        # Anonymous pages would otherwise come from the page cache.
+        with override_settings(BLOGGER_PAGE_CACHE_TIMEOUT=0):
+            return {
+                "cold": bench.first_request_latency(scenarios, warm=False),
+                "warm": bench.first_request_latency(scenarios, warm=True),
+            }
+
+    def handle(self, *args, **options):
+        profile = options["sqlite_profile"] or sqlite.get_profile()
+        template_mode = options["template_mode"] or settings.BLOGGER_TEMPLATE_MODE
+        setup_test_environment()
+        directory = tempfile.mkdtemp()
+        if connection.vendor == "sqlite":
+            # Worker threads each open their own connection, which an
+            # in-memory test database can't serve without table locks.
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                directory, "bench.sqlite3"
+            )
+            connection.settings_dict["CONN_MAX_AGE"] = (
+                600 if profile == "production" else 0
+            )
+        # Applied before the database exists: WAL mode sticks to the file.
+        profile_override = override_settings(BLOGGER_SQLITE_PROFILE=profile)
+        profile_override.enable()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            for cache in caches.all():
+                cache.clear()
+            self._seed(options)
+            overrides = {
+                "BLOGGER_COMMENT_INGEST": options["comment_ingest"],
+                "BLOGGER_TEMPLATE_MODE": template_mode,
+                "TEMPLATES": bench.template_settings(template_mode),
+            }
+            if options["no_page_cache"]:
+                overrides["BLOGGER_PAGE_CACHE_TIMEOUT"] = 0
+            asgi_scenarios = first_request = None
+            with override_settings(**overrides):
+                if options["first_request"]:
+                    first_request = self._measure_first_request()
+                scenarios = self._measure(options)
+                if options["asgi"]:
+                    asgi_scenarios = self._measure_asgi(options)
+        finally:
+            ingest.get_batcher().close()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            profile_override.disable()
+            teardown_test_environment()
+            shutil.rmtree(directory, ignore_errors=True)
+
+        report = {
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "dataset": {
+                "authors": options["authors"],
+                "posts_per_author": options["posts_per_author"],
+                "comments_per_post": options["comments_per_post"],
+            },
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "page_cache": not options["no_page_cache"],
+            "comment_ingest": options["comment_ingest"],
+            "sqlite_profile": profile if connection.vendor == "sqlite" else None,
+            "template_mode": template_mode,
+            "scenarios": scenarios,
+        }
+        if first_request is not None:
+            report["first_request"] = first_request
+        if asgi_scenarios is not None:
+            report["asgi_scenarios"] = asgi_scenarios
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from blogger import feeds
+from blogger.models import Post, Author, Comment
+from blogger.pagination import CursorPaginator
+
+
+class Command(BaseCommand):
+    help = "Print the query plan of every query the blogger views run."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error if any query scans a table or sorts in a temp b-tree.",
+        )
+
+    def _querysets(self):
+        post_id, slug, author_id, username = 1, "slug", 1, "username"
+        sample = Post.objects.select_related("author").first()
+        if sample is not None:
+            post_id, slug = sample.id, sample.title_slug
+            author_id, username = sample.author_id, sample.author.username
+        position = (datetime.now(timezone.utc), post_id)
+
+        posts = Post.objects.for_listing()
+        author_posts = Post.objects.for_listing().filter(author_id=author_id)
+        comments = Comment.objects.filter(post_id=post_id).select_related("author")
+        return [
+            ("index: numbered page", posts[:10]),
+            ("index: cursor page", CursorPaginator(posts, 10).page_queryset(position)),
+            (
+                "view_post: post",
+                Post.objects.select_related("author").filter(title_slug=slug),
+            ),
+            (
+                "view_post: comments",
+                CursorPaginator(comments, 50, descending=False).page_queryset(None),
+            ),
+            (
+                "comments: next page",
+                CursorPaginator(comments, 50, descending=False).page_queryset(position),
+            ),
+            (
+                "view_blogger: author",
+                Author.objects.filter(username=username),
+            ),
+            ("view_blogger: numbered page", author_posts[:10]),
+            (
+                "view_blogger: cursor page",
+                CursorPaginator(author_posts, 10).page_queryset(position),
+            ),
+            ("feed: posts", feeds.latest_posts(Post.objects.for_feed())),
+            (
+                "author_feed: posts",
+                feeds.latest_posts(Post.objects.for_feed(), username),
+            ),
+            (
+                "author_feed: validators",
+                feeds.latest_posts(
+                    Post.objects.values_list("id", "modified"), username
+                ),
+            ),
+        ]
+
+    def _problems(self, line):
+        if connection.vendor != "sqlite":
+            return []
+        problems = []
+        if line.startswith("SCAN") and "INDEX" not in line:
+            problems.append("full table scan")
+        if "TEMP B-TREE" in line:
+            problems.append("temporary sort")
+        return problems
+
+    def handle(self, *args, **options):
+        failures = 0
+        for label, queryset in self._querysets():
+            plan = queryset.explain()
+            self.stdout.write(label)
+            for row in plan.splitlines():
+                line = row.split(" ", 3)[-1] if connection.vendor == "sqlite" else row
+                problems = self._problems(line)
+                failures += len(problems)
+                suffix = f"  <-- {', '.join(problems)}" if problems else ""
+                self.stdout.write(f"    {line}{suffix}")
+
+        if failures:
+            message = f"{failures} problem(s) found in query plans"
+            if options["fail_on_scan"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No full table scans found"))
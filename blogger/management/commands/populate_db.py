@@ -1,48 +1,248 @@
+import random
+from itertools import islice
+
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
 from django.contrib.auth import get_user_model
-from blogger.models import Post, Author, Comment
-
-from faker import Faker
-from faker.providers import person
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.text import slugify
+from blogger import page_cache, search
+from blogger.models import (
+    SLUG_BASE_LENGTH,
+    Post,
+    Author,
+    Comment,
+    SlugCounter,
+    summarize,
+)
 
 User = get_user_model()
 
-fake = Faker()
-Faker.seed(0)
-fake.add_provider(person)
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute "
+    "irure in reprehenderit voluptate velit esse cillum fugiat nulla pariatur "
+    "excepteur sint occaecat cupidatat non proident sunt culpa qui officia deserunt "
+    "mollit anim id est laborum"
+).split()
+
+NAMES = (
+    "alice bob carol dave erin frank grace heidi ivan judy mallory niaj olivia "
+    "peggy rupert sybil trent victor walter"
+).split()
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
 
 
 class Command(BaseCommand):
-    def _create_authors(self):
-        self.authors = []
-        for _ in range(5):
-            user = User.objects.create(
-                username=fake.first_name(), password="top_secret"
+    help = "Fill the database with generated authors, posts and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--authors", type=int, default=5)
+        parser.add_argument("--posts-per-author", type=int, default=5)
+        parser.add_argument("--comments-per-post", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per INSERT; also bounds the comments written per transaction.",
+        )
+
+    def _words(self, low, high):
+        return " ".join(self.random.choices(WORDS, k=self.random.randint(low, high)))
+
+    def _next_id(self, model):
+        return (model.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+
+    def _free_usernames(self, usernames):
+        # Someone may have signed up with a name like the generated ones.
+        while True:
+            taken = set()
+            for batch in batched(usernames, 500):
+                taken.update(
+                    User.objects.filter(username__in=batch).values_list(
+                        "username", flat=True
+                    )
+                )
+            if not taken:
+                return usernames
+            usernames = [f"{name}_" if name in taken else name for name in usernames]
+
+    def _reset_sequences(self):
+        # Rows were inserted with explicit ids, which doesn't advance the
+        # sequences of databases other than SQLite.
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [User, Author, Post, Comment]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def _create_authors(self, count, batch_size):
+        # bulk_create() skips the post_save signal that normally creates the
+        # Author, so both rows are written here with ids chosen up front.
+        first_user_id = self._next_id(User)
+        first_author_id = self._next_id(Author)
+        password = make_password("top_secret")
+        usernames = self._free_usernames(
+            [f"{self.random.choice(NAMES)}{first_user_id + i}" for i in range(count)]
+        )
+        users = (
+            User(id=first_user_id + i, username=username, password=password)
+            for i, username in enumerate(usernames)
+        )
+        authors = (
+            Author(
+                id=first_author_id + i, user_id=first_user_id + i, username=username
             )
-            author = Author.objects.get(user=user)
-            self.authors.append(author)
-
-    def _create_posts(self):
-        self.posts = []
-        for author in self.authors:
-            for _ in range(5):
-                post = Post.objects.create(
-                    title=fake.text(),
-                    content="\n".join(
-                        [("".join([fake.text() for _ in range(5)])) for _ in range(5)]
-                    ),
-                    author=author,
+            for i, username in enumerate(usernames)
+        )
+        with transaction.atomic():
+            for batch in batched(users, batch_size):
+                User.objects.bulk_create(batch)
+            for batch in batched(authors, batch_size):
+                Author.objects.bulk_create(batch)
+        return range(first_author_id, first_author_id + count)
+
+    def _posts(self, author_ids, posts_per_author, first_post_id):
+        post_id = first_post_id
+        for author_id in author_ids:
+            for _ in range(posts_per_author):
+                title = self._words(3, 8).capitalize()
+                # The id suffix keeps the slug unique without probing the table.
+                base = slugify(title)[:SLUG_BASE_LENGTH].strip("-") or "post"
+                slug = f"{base}-{post_id}"
+                content = "\n".join(self._words(40, 80) for _ in range(5))
+                excerpt, word_count = summarize(content)
+                yield Post(
+                    id=post_id,
+                    title=title,
+                    title_slug=slug,
+                    content=content,
+                    excerpt=excerpt,
+                    word_count=word_count,
+                    author_id=author_id,
                 )
-                self.posts.append(post)
+                post_id += 1
+
+    def _reserve_slugs(self, posts):
+        # A generated "<base>-<id>" is what SlugCounter.next_slug(base) hands
+        # out once its counter reaches <id>, so counters are moved past the
+        # ids used here and posts created later never try a taken slug.
+        last = {}
+        for post in posts:
+            base = post.title_slug.rsplit("-", 1)[0]
+            last[base] = max(last.get(base, 0), post.id)
+        existing = SlugCounter.objects.filter(base__in=last).in_bulk(field_name="base")
+        behind = []
+        for base, counter in existing.items():
+            if counter.last < last[base]:
+                counter.last = last[base]
+                behind.append(counter)
+        SlugCounter.objects.bulk_update(behind, ["last"])
+        SlugCounter.objects.bulk_create(
+            SlugCounter(base=base, last=value)
+            for base, value in last.items()
+            if base not in existing
+        )
 
-    def _create_comments(self):
-        for post in self.posts:
-            for author in self.authors:
-                Comment.objects.create(
-                    comment_text=fake.text(), post=post, author=author
+    def _comment_rows(self, posts, author_ids, comments_per_post):
+        # Comments are the bulk of the data, so they skip model instances
+        # and are drawn from a pool of pre-generated texts.
+        for post in posts:
+            for _ in range(comments_per_post):
+                yield (
+                    self.random.choice(self.comment_texts),
+                    post.id,
+                    self.random.choice(author_ids),
                 )
 
+    def _insert_comments(self, rows):
+        meta = Comment._meta
+        columns = ", ".join(
+            connection.ops.quote_name(meta.get_field(name).column)
+            for name in ("comment_text", "created", "post", "author")
+        )
+        created = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {connection.ops.quote_name(meta.db_table)} "
+                f"({columns}) VALUES (%s, %s, %s, %s)",
+                [
+                    (text, created, post_id, author_id)
+                    for text, post_id, author_id in rows
+                ],
+            )
+
     def handle(self, *args, **options):
-        self._create_authors()
-        self._create_posts()
-        self._create_comments()
+        self.random = random.Random(options["seed"])
+        self.comment_texts = [
+            self._words(8, 20).capitalize() + "." for _ in range(1000)
+        ]
+        batch_size = options["batch_size"]
+        comments_per_post = options["comments_per_post"]
+
+        author_ids = self._create_authors(options["authors"], batch_size)
+        if not author_ids:
+            return
+
+        latest = (
+            Comment.objects.filter(post=OuterRef("pk"))
+            .order_by("-created")
+            .values("created")[:1]
+        )
+        first_post_id = self._next_id(Post)
+        posts = self._posts(author_ids, options["posts_per_author"], first_post_id)
+        posts_per_transaction = max(1, batch_size // max(1, comments_per_post))
+        total_posts = total_comments = 0
+        for post_batch in batched(posts, posts_per_transaction):
+            with transaction.atomic():
+                Post.objects.bulk_create(post_batch, batch_size=batch_size)
+                self._reserve_slugs(post_batch)
+                for comment_batch in batched(
+                    self._comment_rows(post_batch, author_ids, comments_per_post),
+                    batch_size,
+                ):
+                    self._insert_comments(comment_batch)
+                    total_comments += len(comment_batch)
+                if comments_per_post:
+                    Post.objects.filter(
+                        id__gte=post_batch[0].id, id__lte=post_batch[-1].id
+                    ).update(
+                        comment_count=comments_per_post,
+                        last_commented_at=Subquery(latest),
+                    )
+            total_posts += len(post_batch)
+
+        self._reset_sequences()
+        if search.uses_fts():
+            # The bulk inserts above bypass the save() hooks that index rows.
+            # Only this run's rows are added; the rest of the index is kept.
+            last_post_id = first_post_id + total_posts - 1
+            search.index_posts(
+                Post.objects.filter(id__gte=first_post_id, id__lte=last_post_id),
+                batch_size,
+            )
+            search.index_comments(
+                Comment.objects.filter(post__gte=first_post_id, post__lte=last_post_id),
+                batch_size,
+            )
+        page_cache.purge(page_cache.group_name("feed"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(author_ids)} authors, {total_posts} posts "
+                f"and {total_comments} comments"
+            )
+        )
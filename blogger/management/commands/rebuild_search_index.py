@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from blogger import search
+from blogger.models import Post, Comment
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from all posts and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of rows indexed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if not search.uses_fts():
+            raise CommandError(
+                "The search index is only available on SQLite with FTS5; "
+                "other databases search posts directly."
+            )
+        batch_size = options["batch_size"]
+        with transaction.atomic():
+            search.clear()
+        posts = search.index_posts(Post.objects.all(), batch_size)
+        comments = search.index_comments(Comment.objects.all(), batch_size)
+        search.optimize()
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {posts} posts and {comments} comments")
+        )
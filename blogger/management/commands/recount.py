@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from blogger.models import Post, Comment
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.comment_count and Post.last_commented_at from comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of posts updated per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        comments = Comment.objects.filter(post=OuterRef("pk")).order_by()
+        count = comments.values("post").annotate(count=Count("id")).values("count")
+        latest = comments.order_by("-created").values("created")[:1]
+
+        total = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Post.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                Post.objects.filter(id__gt=last_id, id__lte=ids[-1]).update(
+                    comment_count=Coalesce(Subquery(count), 0),
+                    last_commented_at=Subquery(latest),
+                )
+            total += len(ids)
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted comments for {total} posts"))
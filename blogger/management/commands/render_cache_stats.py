@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from blogger import render_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the rendered post body cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the counters afterwards."
+        )
+
+    def handle(self, *args, **options):
+        if not render_cache.counts_lookups():
+            self.stderr.write(
+                "Lookups are not counted; set BLOGGER_RENDER_CACHE_STATS = True."
+            )
+        stats = render_cache.stats()
+        self.stdout.write(f"hits: {stats['hits']}")
+        self.stdout.write(f"misses: {stats['misses']}")
+        self.stdout.write(f"hit ratio: {stats['hit_ratio']:.2%}")
+        if options["reset"]:
+            render_cache.reset_stats()
@@ -0,0 +1,57 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from blogger.routers import get_replicas
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the default SQLite database over each of BLOGGER_READ_DATABASES. "
+        "Other databases replicate on their own."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep copying every this many seconds instead of once.",
+        )
+
+    def _copy(self, alias):
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[alias]
+        # The copy replaces the replica's pages under any open connection.
+        replica.close()
+        primary.ensure_connection()
+        target = sqlite3.connect(replica.settings_dict["NAME"])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+
+    def handle(self, *args, **options):
+        replicas = get_replicas()
+        if not replicas:
+            raise CommandError("BLOGGER_READ_DATABASES is empty.")
+        for alias in [DEFAULT_DB_ALIAS] + replicas:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(
+                    f"Database {alias!r} is not SQLite; use its own replication."
+                )
+
+        while True:
+            start = time.perf_counter()
+            for alias in replicas:
+                self._copy(alias)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Copied the database to {', '.join(replicas)} in {elapsed:.0f}ms"
+                )
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
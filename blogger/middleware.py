@@ -0,0 +1,153 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+from blogger import authors, templating
+
+logger = logging.getLogger("blogger.performance")
+
+_query_timer = ContextVar("blogger_query_timer", default=None)
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.count += 1
+                self.duration += time.perf_counter() - start
+
+
+@contextmanager
+def record_queries():
+    """
+    Report the queries run by this thread to the sampled request's
+    QueryTimer, if there is one. Async views wrap the work they hand to
+    worker threads in this, since those threads have connections of their
+    own.
+    """
+    timer = _query_timer.get()
+    with ExitStack() as stack:
+        if timer is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+        yield
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, database and template time and response size for a
+    sample of requests, as a Server-Timing header and a JSON log line on the
+    "blogger.performance" logger.
+
+    BLOGGER_PERFORMANCE_SAMPLE_RATE is the fraction of requests measured;
+    the others only pay for one random() call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Lets the handler call this middleware without a thread hop.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def _sampled(self):
+        rate = getattr(settings, "BLOGGER_PERFORMANCE_SAMPLE_RATE", 0.0)
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        queries = QueryTimer()
+        query_token = _query_timer.set(queries)
+        timer, token = templating.start_timer()
+        start = time.perf_counter()
+        try:
+            with record_queries():
+                response = self.get_response(request)
+        finally:
+            templating.stop_timer(token)
+            _query_timer.reset(query_token)
+        return self._report(request, response, queries, timer, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        # Only queries run through record_queries() are counted here; the
+        # session and auth lookups happen on a thread this coroutine can't
+        # wrap.
+        queries = QueryTimer()
+        query_token = _query_timer.set(queries)
+        timer, token = templating.start_timer()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            templating.stop_timer(token)
+            _query_timer.reset(query_token)
+        return self._report(request, response, queries, timer, start)
+
+    def _report(self, request, response, queries, timer, start):
+        total = time.perf_counter() - start
+        size = None if response.streaming else len(response.content)
+        record = {
+            "view": getattr(request.resolver_match, "view_name", None),
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 3),
+            "db_queries": queries.count,
+            "db_ms": round(queries.duration * 1000, 3),
+            "template_ms": round(timer.duration * 1000, 3),
+            "response_bytes": size,
+        }
+        response["Server-Timing"] = ", ".join(
+            [
+                f"total;dur={record['total_ms']}",
+                f'db;dur={record["db_ms"]};desc="{queries.count} queries"',
+                f"tpl;dur={record['template_ms']}",
+            ]
+        )
+        logger.info(json.dumps(record))
+        return response
+
+
+class CurrentAuthorMiddleware:
+    """
+    Set request.author to the logged-in user's Author (None for anonymous
+    visitors). It is looked up the first time a view uses it, from the
+    cache when possible; must come after AuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        request.author = SimpleLazyObject(lambda: authors.resolve(request.user))
+        return self.get_response(request)
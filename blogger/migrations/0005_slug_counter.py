@@ -0,0 +1,21 @@
+# Generated by Django 3.1.3 on 2026-10-18 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogger', '0004_post_comment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base', models.SlugField(unique=True)),
+                ('last', models.PositiveIntegerField(default=1)),
+            ],
+        ),
+    ]
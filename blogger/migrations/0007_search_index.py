@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS blogger_search "
+            "USING fts5(title, body, post_id UNINDEXED, tokenize='porter unicode61')"
+        )
+    except OperationalError:
+        # SQLite built without FTS5; search falls back to LIKE queries.
+        return
+    # Rows leave the index in the database, so comments removed by a
+    # cascade or a queryset's delete() go too and keep their fast delete.
+    # The rowids follow blogger.search.post_rowid() and comment_rowid().
+    # A migration that remakes either table has to create its trigger again.
+    schema_editor.execute(
+        "CREATE TRIGGER IF NOT EXISTS blogger_post_unindex "
+        "AFTER DELETE ON blogger_post BEGIN "
+        "DELETE FROM blogger_search WHERE rowid = old.id * 2; END"
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER IF NOT EXISTS blogger_comment_unindex "
+        "AFTER DELETE ON blogger_comment BEGIN "
+        "DELETE FROM blogger_search WHERE rowid = old.id * 2 + 1; END"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TRIGGER IF EXISTS blogger_post_unindex")
+        schema_editor.execute("DROP TRIGGER IF EXISTS blogger_comment_unindex")
+        schema_editor.execute("DROP TABLE IF EXISTS blogger_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blogger", "0006_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.1.3 on 2026-10-18 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogger', '0008_comment_thread_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='username',
+            field=models.CharField(db_index=True, default='', max_length=150),
+            preserve_default=False,
+        ),
+    ]
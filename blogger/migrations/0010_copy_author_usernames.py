@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def copy_usernames(apps, schema_editor):
+    # Batches of authors, each committed on its own, so writers are only held
+    # up for one batch at a time however many users there are. Posts and
+    # comments keep pointing at Author and are not rewritten.
+    Author = apps.get_model('blogger', 'Author')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    alias = schema_editor.connection.alias
+    username = User.objects.filter(pk=OuterRef('user_id')).values('username')[:1]
+    last_id = 0
+    while True:
+        ids = list(
+            Author.objects.using(alias)
+            .filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            break
+        with transaction.atomic(using=alias):
+            Author.objects.using(alias).filter(
+                id__gt=last_id, id__lte=ids[-1]
+            ).update(username=Subquery(username))
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('blogger', '0009_author_username'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_usernames, migrations.RunPython.noop),
+    ]
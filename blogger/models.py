@@ -1,19 +1,109 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_save
 from django.urls import reverse
-from django.utils.text import slugify
+from django.utils.text import Truncator, slugify
 from django.contrib.auth import get_user_model
 from django.dispatch import receiver
 from django.db.utils import IntegrityError
+from blogger import page_cache, permalinks, render_cache, search
 
 User = get_user_model()
 
+SLUG_BASE_LENGTH = 40
+SLUG_ATTEMPTS = 5
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+
+def summarize(content):
+    """
+    Return the plaintext excerpt and word count stored alongside a post's
+    content.
+    """
+    words = content.split()
+    # split() already copies the post once, to count its words. No word is
+    # shorter than a character, so its first EXCERPT_LENGTH words are enough
+    # to fill the excerpt and the rest are never joined back together.
+    lead = " ".join(words[:EXCERPT_LENGTH])
+    return Truncator(lead).chars(EXCERPT_LENGTH), len(words)
+
 
 class Author(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # A copy of user.username, kept in step by the User post_save receiver
+    # below, so listings and lookups by username don't join the user table.
+    username = models.CharField(max_length=150, db_index=True)
+
+    def __str__(self):
+        return self.username
+
+
+class SlugCounter(models.Model):
+    """
+    The last numeric suffix handed out for a slugified title, so a new post
+    gets a free slug in a fixed number of queries however common its title.
+    """
+
+    base = models.SlugField(unique=True)
+    last = models.PositiveIntegerField(default=1)
 
     def __str__(self):
-        return self.user.username
+        return f"{self.base}-{self.last}"
+
+    @classmethod
+    def next_slug(cls, base):
+        with transaction.atomic():
+            counter, created = cls.objects.get_or_create(base=base)
+            if created:
+                return base
+            cls.objects.filter(pk=counter.pk).update(last=F("last") + 1)
+            counter.refresh_from_db(fields=["last"])
+        return f"{base}-{counter.last}"
+
+
+class PostQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Only the columns feed and profile listings render, with the author's
+        username joined in as ``author_username``; ``content`` is never read.
+        """
+        return self.only(
+            "id",
+            "title",
+            "title_slug",
+            "created",
+            "author",
+            "comment_count",
+            "last_commented_at",
+            "excerpt",
+            "word_count",
+        ).annotate(author_username=F("author__username"))
+
+    def by_author(self, username):
+        """
+        Posts of the author with this username. The author's id comes from a
+        subquery, so newest-first pages are read from the (author, created,
+        id) index without a sort.
+        """
+        author = Author.objects.filter(username=username).values("id")[:1]
+        return self.filter(author_id=Subquery(author))
+
+    def for_feed(self):
+        """
+        Like for_listing(), with ``modified`` instead of the comment counters,
+        for Atom and RSS entries.
+        """
+        return self.only(
+            "id",
+            "title",
+            "title_slug",
+            "created",
+            "modified",
+            "author",
+            "excerpt",
+        ).annotate(author_username=F("author__username"))
 
 
 class Post(models.Model):
@@ -23,9 +113,21 @@ class Post(models.Model):
     title = models.CharField(max_length=255)
     title_slug = models.SlugField(unique=True)
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
+    comment_count = models.PositiveIntegerField(default=0)
+    last_commented_at = models.DateTimeField(null=True, blank=True)
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="")
+    word_count = models.PositiveIntegerField(default=0)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
-        ordering = ("-created",)
+        ordering = ("-created", "-id")
+        indexes = [
+            models.Index(fields=["-created", "-id"], name="post_created_id_idx"),
+            models.Index(
+                fields=["author", "-created", "-id"], name="post_author_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -33,13 +135,47 @@ class Post(models.Model):
     def get_absolute_url(self):
         return reverse("blogger:view_post", args=[self.title_slug])
 
+    @property
+    def reading_time(self):
+        return max(1, -(-self.word_count // WORDS_PER_MINUTE))
+
     def save(self, *args, **kwargs):
         if self.title == "":
             raise IntegrityError("No title provided")
         if self.content == "":
             raise IntegrityError("No content provided")
-        self.title_slug = slugify(self.title)
-        return super().save(*args, **kwargs)
+        self.excerpt, self.word_count = summarize(self.content)
+        render_cache.invalidate(self)
+        with transaction.atomic():
+            if self.title_slug:
+                result = super().save(*args, **kwargs)
+            else:
+                result = self._save_with_new_slug(*args, **kwargs)
+            search.index_post(self)
+        permalinks.invalidate(self.title_slug)
+        page_cache.purge_post(self)
+        return result
+
+    def _save_with_new_slug(self, *args, **kwargs):
+        # The slug is chosen once, on creation, so editing the title never
+        # moves the post. A slug can still be taken by a post whose own title
+        # slugifies to "<base>-<n>"; the next suffix is tried then.
+        base = slugify(self.title)[:SLUG_BASE_LENGTH].strip("-") or "post"
+        for attempt in range(SLUG_ATTEMPTS):
+            self.title_slug = SlugCounter.next_slug(base)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                self.title_slug = ""
+                if attempt == SLUG_ATTEMPTS - 1:
+                    raise
+
+    def delete(self, *args, **kwargs):
+        render_cache.invalidate(self)
+        permalinks.invalidate(self.title_slug)
+        page_cache.purge_post(self)
+        return super().delete(*args, **kwargs)
 
 
 class Comment(models.Model):
@@ -50,12 +186,54 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ("created",)
+        indexes = [
+            models.Index(
+                fields=["post", "created", "id"], name="comment_post_created_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.comment_text
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            search.index_comment(self)
+            if adding:
+                Post.objects.filter(pk=self.post_id).update(
+                    comment_count=F("comment_count") + 1,
+                    last_commented_at=self.created,
+                )
+                page_cache.purge_post(self.post)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            latest = Comment.objects.filter(post=OuterRef("pk")).order_by("-created")
+            Post.objects.filter(pk=self.post_id).update(
+                comment_count=Greatest(F("comment_count") - 1, 0),
+                last_commented_at=Subquery(latest.values("created")[:1]),
+            )
+            page_cache.purge_post(self.post)
+        return result
+
 
 @receiver(post_save, sender=User)
 def create_author(sender, **kwargs):
+    user = kwargs["instance"]
     if kwargs["created"]:
-        Author.objects.create(user=kwargs["instance"])
+        Author.objects.create(user=user, username=user.username)
+        # The "No Author Found" page may be cached under this username.
+        page_cache.purge_author(user.username)
+        return
+    update_fields = kwargs["update_fields"]
+    if update_fields is None or "username" in update_fields:
+        renamed = Author.objects.filter(user=user).exclude(username=user.username)
+        old_username = renamed.values_list("username", flat=True).first()
+        if old_username is not None:
+            renamed.update(username=user.username)
+            slugs = Post.objects.filter(author__user=user).values_list(
+                "title_slug", flat=True
+            )
+            page_cache.purge_renamed_author(old_username, user.username, slugs)
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from blogger import routers
+
+
+def get_cache():
+    return caches[getattr(settings, "BLOGGER_PAGE_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "BLOGGER_PAGE_CACHE_TIMEOUT", 300)
+
+
+def group_name(kind, value=None):
+    return kind if value is None else f"{kind}:{value}"
+
+
+def _generation_key(group):
+    return f"blogger:page-generation:{group}"
+
+
+def _generation(group):
+    """
+    Every cached page is stored under its group's current generation, so
+    purging a group is a single write no matter how many query strings of
+    the page have been cached. A generation that was evicted is recreated
+    with a fresh value, so pages cached under the old one are never served.
+    """
+    cache = get_cache()
+    key = _generation_key(group)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def page_key(group, full_path, generation=None):
+    if generation is None:
+        generation = _generation(group)
+    digest = hashlib.md5(full_path.encode()).hexdigest()
+    return f"blogger:page:{group}:{generation}:{digest}"
+
+
+def purge(group):
+    get_cache().set(_generation_key(group), time.time_ns(), None)
+
+
+def _purge_on_commit(groups):
+    def _purge():
+        for group in groups:
+            purge(group)
+
+    transaction.on_commit(_purge)
+
+
+def purge_post(post):
+    _purge_on_commit(
+        [
+            group_name("feed"),
+            group_name("post", post.title_slug),
+            group_name("author", post.author.username),
+        ]
+    )
+
+
+def purge_author(*usernames):
+    _purge_on_commit([group_name("author", username) for username in usernames])
+
+
+def purge_renamed_author(old_username, new_username, post_slugs):
+    # The feed and the author's post pages show the name and link to the
+    # author page under it.
+    _purge_on_commit(
+        [
+            group_name("feed"),
+            group_name("author", old_username),
+            group_name("author", new_username),
+        ]
+        + [group_name("post", slug) for slug in post_slugs]
+    )
+
+
+def _is_cacheable(request):
+    return (
+        get_timeout()
+        and request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+    )
+
+
+def _lookup(request, kind, args):
+    """
+    Return the cache key and group generation for this request, or None if
+    it must not be cached, and the cached response if there is one.
+    """
+    if not _is_cacheable(request):
+        return None, None
+    group = group_name(kind, args[0] if args else None)
+    generation = _generation(group)
+    key = page_key(group, request.get_full_path(), generation)
+    cached = get_cache().get(key)
+    if cached is None:
+        return (key, generation), None
+    content, content_type, status = cached
+    return (key, generation), HttpResponse(
+        content, content_type=content_type, status=status
+    )
+
+
+def _replica_may_lag(generation):
+    # The generation is the time of the group's last purge. A page read from
+    # a replica soon after it may predate the write that caused the purge,
+    # and caching it would undo the purge until the page expires.
+    if not routers.reading_from_replica():
+        return False
+    return time.time_ns() - generation < routers.get_sticky_seconds() * 10**9
+
+
+def _store(request, entry, response):
+    key, generation = entry
+    if (
+        response.status_code == 200
+        and not _replica_may_lag(generation)
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_USED")
+    ):
+        get_cache().set(
+            key,
+            (response.content, response["Content-Type"], response.status_code),
+            get_timeout(),
+        )
+
+
+def cache_anonymous_page(kind):
+    """
+    Cache the response of a read view for anonymous users.
+
+    The page joins the group ``kind``, or ``kind:<first view argument>`` for
+    views that take one, which is what purge_post() invalidates. Async views
+    are supported; the cache is then read and written from a thread.
+    """
+
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def _wrapped_async_view(request, *args, **kwargs):
+                entry, cached = await sync_to_async(_lookup)(request, kind, args)
+                if cached is not None:
+                    return cached
+                response = await view_func(request, *args, **kwargs)
+                if entry is not None:
+                    await sync_to_async(_store)(request, entry, response)
+                return response
+
+            return _wrapped_async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            entry, cached = _lookup(request, kind, args)
+            if cached is not None:
+                return cached
+            response = view_func(request, *args, **kwargs)
+            if entry is not None:
+                _store(request, entry, response)
+            return response
+
+        return _wrapped_view
+
+    return decorator
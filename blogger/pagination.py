@@ -0,0 +1,145 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    raw = "|".join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, length):
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    except (binascii.Error, UnicodeDecodeError):
+        raise InvalidCursor(token)
+    if len(values) != length:
+        raise InvalidCursor(token)
+    return values
+
+
+class CursorPage:
+    """
+    A page of a keyset-paginated listing.
+
+    Mirrors the parts of django.core.paginator.Page the templates use, but
+    never knows the total number of pages.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __contains__(self, item):
+        return item in self.object_list
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.cursor_for(self.object_list[-1])
+
+
+class CursorPaginator:
+    """
+    Paginates a queryset on (created, id) without OFFSET or COUNT(*).
+
+    Every page is a single index range scan starting right after the row
+    encoded in the cursor, so deep pages cost the same as the first one.
+    """
+
+    def __init__(self, object_list, per_page, descending=True):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.descending = descending
+
+    def cursor_for(self, obj):
+        return encode_cursor(obj.created.isoformat(), obj.pk)
+
+    def position_for(self, cursor):
+        created, pk = decode_cursor(cursor, 2)
+        try:
+            return datetime.fromisoformat(created), int(pk)
+        except ValueError:
+            raise InvalidCursor(cursor)
+
+    def page_queryset(self, position):
+        if self.descending:
+            queryset = self.object_list.order_by("-created", "-id")
+            if position:
+                created, pk = position
+                queryset = queryset.filter(created__lte=created).exclude(
+                    created=created, id__gte=pk
+                )
+        else:
+            queryset = self.object_list.order_by("created", "id")
+            if position:
+                created, pk = position
+                queryset = queryset.filter(created__gte=created).exclude(
+                    created=created, id__lte=pk
+                )
+        return queryset[: self.per_page + 1]
+
+    def get_page(self, cursor):
+        position = None
+        if cursor:
+            try:
+                position = self.position_for(cursor)
+            except InvalidCursor:
+                pass
+
+        rows = list(self.page_queryset(position))
+        return CursorPage(
+            rows[: self.per_page],
+            self,
+            has_next=len(rows) > self.per_page,
+            has_previous=position is not None,
+        )
+
+
+def paginate(request, object_list, per_page=10):
+    if getattr(settings, "BLOGGER_PAGINATION", "numbered") == "cursor":
+        paginator = CursorPaginator(object_list, per_page)
+        return paginator.get_page(request.GET.get("after"))
+    paginator = Paginator(object_list, per_page)
+    return paginator.get_page(request.GET.get("page"))
+
+
+def paginate_comments(request, comments):
+    """
+    A post's comments, oldest first. Threads can grow without bound, so
+    they are always keyset-paginated, whatever BLOGGER_PAGINATION says.
+    """
+    per_page = getattr(settings, "BLOGGER_COMMENTS_PER_PAGE", 50)
+    paginator = CursorPaginator(comments, per_page, descending=False)
+    return paginator.get_page(request.GET.get("after"))
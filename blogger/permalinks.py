@@ -0,0 +1,37 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.http import Http404
+
+PERMALINK_TIMEOUT = 60 * 60 * 24
+
+Permalink = namedtuple("Permalink", ["post_id", "author_id", "user_id"])
+
+
+def _key(slug):
+    return f"blogger:permalink:{slug}"
+
+
+def resolve(slug):
+    """
+    Map a post slug to the ids needed for routing and permission checks,
+    without reading the post row on a cache hit.
+    """
+    from blogger.models import Post
+
+    permalink = cache.get(_key(slug))
+    if permalink is None:
+        row = (
+            Post.objects.filter(title_slug=slug)
+            .values_list("id", "author_id", "author__user_id")
+            .first()
+        )
+        if row is None:
+            raise Http404("No post matches the given slug.")
+        permalink = Permalink(*row)
+        cache.set(_key(slug), tuple(permalink), PERMALINK_TIMEOUT)
+    return Permalink(*permalink)
+
+
+def invalidate(slug):
+    cache.delete(_key(slug))
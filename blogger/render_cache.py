@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.template.defaultfilters import linebreaksbr
+from django.utils.safestring import mark_safe
+
+HITS_KEY = "blogger:post-body:hits"
+MISSES_KEY = "blogger:post-body:misses"
+
+
+def get_cache():
+    return caches[getattr(settings, "BLOGGER_RENDER_CACHE_ALIAS", "default")]
+
+
+def body_key(post_id, modified):
+    return f"blogger:post-body:{post_id}:{modified.timestamp()}"
+
+
+def counts_lookups():
+    return getattr(settings, "BLOGGER_RENDER_CACHE_STATS", False)
+
+
+def _count(key):
+    # Two more cache round trips per render, so only when asked for.
+    if not counts_lookups():
+        return
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def render_body(post):
+    cache = get_cache()
+    key = body_key(post.pk, post.modified)
+    body = cache.get(key)
+    if body is None:
+        _count(MISSES_KEY)
+        body = linebreaksbr(post.content, autoescape=True)
+        timeout = getattr(settings, "BLOGGER_RENDER_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(key, str(body), timeout)
+    else:
+        _count(HITS_KEY)
+    return mark_safe(body)
+
+
+def invalidate(post):
+    if post.pk is not None and post.modified is not None:
+        get_cache().delete(body_key(post.pk, post.modified))
+
+
+def stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+    }
+
+
+def reset_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
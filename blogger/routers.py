@@ -0,0 +1,147 @@
+import asyncio
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+PRIMARY = "default"
+STICKY_COOKIE = "blogger_primary"
+
+_read_database = ContextVar("blogger_read_database", default=None)
+
+
+def get_replicas():
+    return getattr(settings, "BLOGGER_READ_DATABASES", [])
+
+
+def get_sticky_seconds():
+    # Also how far behind the primary a replica is assumed to fall at most.
+    return getattr(settings, "BLOGGER_REPLICA_STICKY_SECONDS", 30)
+
+
+def reading_from_replica():
+    return _read_database.get() is not None
+
+
+def get_replica_apps():
+    return getattr(settings, "BLOGGER_REPLICA_APPS", ("blogger",))
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of views marked with read_from_replica() to one of the
+    BLOGGER_READ_DATABASES, and everything else, writes included, to the
+    primary.
+
+    Only models of BLOGGER_REPLICA_APPS are read from a replica. Sessions and
+    the logged-in user always come from the primary, so logging in or
+    signing up is never undone by replica lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_database.get()
+        if alias is not None and model._meta.app_label in get_replica_apps():
+            return alias
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary (see the sync_replicas command).
+        if db in get_replicas():
+            return False
+        return None
+
+
+def _replica_for(request):
+    replicas = get_replicas()
+    if (
+        not replicas
+        or request.method not in ("GET", "HEAD")
+        or STICKY_COOKIE in request.COOKIES
+    ):
+        return None
+    return random.choice(replicas)
+
+
+def _iterate_on(alias, iterator):
+    # A streamed body is produced after the view has returned.
+    iterator = iter(iterator)
+    while True:
+        token = _read_database.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_database.reset(token)
+        yield chunk
+
+
+def _finish(alias, response):
+    if alias is not None and response.streaming:
+        response.streaming_content = _iterate_on(alias, response.streaming_content)
+    return response
+
+
+def read_from_replica(view_func):
+    """
+    Read from a replica during GET and HEAD requests to this view, unless
+    the client wrote something in the last BLOGGER_REPLICA_STICKY_SECONDS.
+    """
+    if asyncio.iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def _wrapped_async_view(request, *args, **kwargs):
+            alias = _replica_for(request)
+            token = _read_database.set(alias)
+            try:
+                response = await view_func(request, *args, **kwargs)
+            finally:
+                _read_database.reset(token)
+            return _finish(alias, response)
+
+        return _wrapped_async_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        alias = _replica_for(request)
+        token = _read_database.set(alias)
+        try:
+            response = view_func(request, *args, **kwargs)
+        finally:
+            _read_database.reset(token)
+        return _finish(alias, response)
+
+    return _wrapped_view
+
+
+def sticky_writes(view_func):
+    """
+    After a POST to this view, send the client's reads to the primary for
+    BLOGGER_REPLICA_STICKY_SECONDS, so it sees its own writes before the
+    replicas catch up.
+    """
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD") and get_replicas():
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=get_sticky_seconds(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    return _wrapped_view
@@ -0,0 +1,218 @@
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection, connections, router, transaction
+from django.db.models import CharField, Q, Value
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from blogger.pagination import (
+    CursorPaginator,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+TABLE = "blogger_search"
+MAX_TERMS = 10
+SNIPPET_TOKENS = 16
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+SearchHit = namedtuple("SearchHit", ["post", "kind", "snippet"])
+SearchResults = namedtuple("SearchResults", ["hits", "next_cursor"])
+
+_fts_available = {}
+
+
+def uses_fts():
+    """
+    FTS5 is used on SQLite when the migration managed to create the index
+    table; everything else falls back to LIKE queries over posts.
+    """
+    if getattr(settings, "BLOGGER_SEARCH_BACKEND", "auto") != "auto":
+        return False
+    if connection.vendor != "sqlite":
+        return False
+    key = connection.settings_dict["NAME"]
+    if key not in _fts_available:
+        _fts_available[key] = TABLE in connection.introspection.table_names()
+    return _fts_available[key]
+
+
+# Posts and comments share the index; their rowids are interleaved so a row
+# can be replaced by rowid instead of scanning unindexed columns. The delete
+# triggers created by migration 0007 remove rows by the same rowids.
+
+
+def post_rowid(post_id):
+    return post_id * 2
+
+
+def comment_rowid(comment_id):
+    return comment_id * 2 + 1
+
+
+def _write(sql, params):
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def insert(rows):
+    _write(
+        f"INSERT INTO {TABLE} (rowid, title, body, post_id) VALUES (%s, %s, %s, %s)",
+        rows,
+    )
+
+
+def _upsert(rows):
+    _write(f"DELETE FROM {TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+    insert(rows)
+
+
+def clear():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+
+
+def optimize():
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+
+def index_post(post):
+    if uses_fts():
+        _upsert([(post_rowid(post.pk), post.title, post.content, post.pk)])
+
+
+def index_comment(comment):
+    if uses_fts():
+        _upsert(
+            [(comment_rowid(comment.pk), "", comment.comment_text, comment.post_id)]
+        )
+
+
+def _index_in_batches(queryset, fields, rowid, batch_size):
+    total = 0
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list(*fields)[:batch_size]
+        )
+        if not rows:
+            return total
+        with transaction.atomic():
+            insert([(rowid(row[0]),) + row[1:] for row in rows])
+        total += len(rows)
+        last_id = rows[-1][0]
+
+
+def index_posts(posts, batch_size):
+    """
+    Add ``posts``, which must not be in the index yet, ``batch_size`` per
+    transaction, and return how many were added.
+    """
+    return _index_in_batches(
+        posts, ("id", "title", "content", "id"), post_rowid, batch_size
+    )
+
+
+def index_comments(comments, batch_size):
+    """Like index_posts(), for ``comments``."""
+    return _index_in_batches(
+        comments.annotate(title=Value("", output_field=CharField())),
+        ("id", "title", "comment_text", "post_id"),
+        comment_rowid,
+        batch_size,
+    )
+
+
+def terms(query):
+    return re.findall(r"\w+", query)[:MAX_TERMS]
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    )
+
+
+def _fts_search(words, cursor, limit):
+    from blogger.models import Post
+
+    match = " ".join('"{}"'.format(word) for word in words)
+    sql = (
+        "SELECT rowid, post_id, rank FROM ("
+        f"SELECT rowid, post_id, bm25({TABLE}, 10.0, 1.0) AS rank "
+        f"FROM {TABLE} WHERE {TABLE} MATCH %s"
+        ") "
+    )
+    params = [match]
+    if cursor:
+        try:
+            rank, rowid = decode_cursor(cursor, 2)
+            rank, rowid = float(rank), int(rowid)
+        except (InvalidCursor, ValueError):
+            pass
+        else:
+            sql += "WHERE rank > %s OR (rank = %s AND rowid > %s) "
+            params += [rank, rank, rowid]
+    sql += "ORDER BY rank, rowid LIMIT %s"
+    params.append(limit + 1)
+
+    # Read the index from wherever Post reads go, a replica included.
+    with connections[router.db_for_read(Post)].cursor() as db:
+        db.execute(sql, params)
+        rows = db.fetchall()
+        page = rows[:limit]
+        snippets = {}
+        if page:
+            placeholders = ", ".join(["%s"] * len(page))
+            db.execute(
+                f"SELECT rowid, snippet({TABLE}, -1, %s, %s, %s, %s) FROM {TABLE} "
+                f"WHERE {TABLE} MATCH %s AND rowid IN ({placeholders})",
+                [MARK_START, MARK_END, "…", SNIPPET_TOKENS, match]
+                + [row[0] for row in page],
+            )
+            snippets = dict(db.fetchall())
+
+    posts = Post.objects.for_listing().in_bulk({row[1] for row in page})
+    hits = [
+        SearchHit(
+            posts[post_id],
+            "post" if rowid % 2 == 0 else "comment",
+            highlight(snippets.get(rowid, "")),
+        )
+        for rowid, post_id, _ in page
+        if post_id in posts
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(repr(page[-1][2]), page[-1][0])
+    return SearchResults(hits, next_cursor)
+
+
+def _basic_search(words, cursor, limit):
+    from blogger.models import Post
+
+    posts = Post.objects.for_listing()
+    for word in words:
+        posts = posts.filter(
+            Q(title__icontains=word)
+            | Q(content__icontains=word)
+            | Q(comment__comment_text__icontains=word)
+        )
+    page = CursorPaginator(posts.distinct(), limit).get_page(cursor)
+    hits = [SearchHit(post, "post", escape(post.excerpt)) for post in page]
+    return SearchResults(hits, page.next_cursor)
+
+
+def search(query, cursor=None, limit=10):
+    words = terms(query)
+    if not words:
+        return SearchResults([], None)
+    if uses_fts():
+        return _fts_search(words, cursor, limit)
+    return _basic_search(words, cursor, limit)
@@ -0,0 +1,42 @@
+from django.conf import settings
+
+# PRAGMAs run on every new SQLite connection, per BLOGGER_SQLITE_PROFILE.
+PROFILES = {
+    # SQLite's own defaults: rollback journal, readers and the writer block
+    # each other.
+    "default": {},
+    "production": {
+        # Readers no longer wait for the writer, nor the writer for readers.
+        "journal_mode": "WAL",
+        # With WAL this only syncs at checkpoints. A power loss (not a crash
+        # of the app) can lose the last transactions, never corrupt the file.
+        "synchronous": "NORMAL",
+        # Wait up to 5s for the write lock instead of failing at once.
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+        # Negative sizes are in KiB: 16 MiB of page cache per connection.
+        "cache_size": -16 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def get_profile():
+    return getattr(settings, "BLOGGER_SQLITE_PROFILE", "default")
+
+
+def get_pragmas():
+    return PROFILES[get_profile()]
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """connection_created receiver."""
+    if connection.vendor != "sqlite":
+        return
+    pragmas = get_pragmas()
+    if not pragmas:
+        return
+    # On the raw connection: these are connection setup, not queries to be
+    # counted or logged with the request's.
+    for name, value in pragmas.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,22 @@
+// Replace the "More comments" link with the next page of comments, fetched
+// as an HTML fragment, instead of reloading the whole post.
+document.addEventListener("click", function (event) {
+    var link = event.target.closest("a[data-fragment]");
+    if (!link) {
+        return;
+    }
+    event.preventDefault();
+    fetch(link.dataset.fragment)
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.text();
+        })
+        .then(function (html) {
+            link.parentElement.outerHTML = html;
+        })
+        .catch(function () {
+            window.location = link.href;
+        });
+});
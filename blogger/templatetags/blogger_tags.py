@@ -0,0 +1,9 @@
+from django import template
+from blogger import render_cache
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_body(post):
+    return render_cache.render_body(post)
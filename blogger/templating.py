@@ -0,0 +1,65 @@
+import time
+from contextvars import ContextVar
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+_timer = ContextVar("blogger_template_timer", default=None)
+
+
+class TemplateTimer:
+    """
+    Accumulates template render time for one request. Templates rendered
+    from inside another template (crispy forms, for one) are not counted
+    twice.
+    """
+
+    def __init__(self):
+        self.duration = 0.0
+        self._depth = 0
+        self._start = None
+
+    def __enter__(self):
+        if self._depth == 0:
+            self._start = time.perf_counter()
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            self.duration += time.perf_counter() - self._start
+
+
+def start_timer():
+    timer = TemplateTimer()
+    return timer, _timer.set(timer)
+
+
+def stop_timer(token):
+    _timer.reset(token)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timer = _timer.get()
+        if timer is None:
+            return super().render(context, request)
+        with timer:
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, with render time reported to the request's
+    TemplateTimer when PerformanceMiddleware samples the request.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,116 @@
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+class PostsApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+        other = User.objects.create(username="other", password="top_secret")
+        cls.other = Author.objects.get(user=other)
+        for i in range(5):
+            Post.objects.create(title=f"Post {i}", content="content", author=cls.author)
+        cls.post = Post.objects.create(
+            title="Other post", content="other content", author=cls.other
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_is_newest_first_without_content(self):
+        data = self.client.get(reverse("blogger:api_posts")).json()
+        self.assertEqual(data["results"][0]["slug"], "other-post")
+        self.assertEqual(data["results"][0]["author"], "other")
+        self.assertNotIn("content", data["results"][0])
+        self.assertIsNone(data["next"])
+
+    def test_sparse_fieldset(self):
+        url = reverse("blogger:api_posts")
+        data = self.client.get(url, {"fields": "slug,title"}).json()
+        self.assertEqual(
+            data["results"][0], {"slug": "other-post", "title": "Other post"}
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse("blogger:api_posts"), {"fields": "secret"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", response.json()["error"])
+
+    def test_list_is_cursor_paginated(self):
+        url = reverse("blogger:api_posts")
+        first = self.client.get(url, {"limit": 4, "fields": "slug"}).json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(first["results"]), 4)
+        self.assertEqual(len(second["results"]), 2)
+        self.assertIsNone(second["next"])
+        self.assertIn("fields=slug", first["next"])
+        slugs = [row["slug"] for row in first["results"] + second["results"]]
+        self.assertEqual(len(set(slugs)), 6)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse("blogger:api_posts"), {"after": "junk"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_filtered_by_author(self):
+        url = reverse("blogger:api_posts")
+        data = self.client.get(url, {"author": "other"}).json()
+        self.assertEqual([row["slug"] for row in data["results"]], ["other-post"])
+
+    def test_list_is_one_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(reverse("blogger:api_posts"))
+
+    def test_detail_includes_content(self):
+        url = reverse("blogger:api_post", args=("other-post",))
+        data = self.client.get(url).json()
+        self.assertEqual(data["content"], "other content")
+        self.assertEqual(data["id"], self.post.pk)
+
+    def test_missing_post_is_json_404(self):
+        response = self.client.get(reverse("blogger:api_post", args=("missing",)))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"error": "Not found"})
+
+    def test_comments_are_oldest_first(self):
+        for text in ("first", "second"):
+            Comment.objects.create(
+                comment_text=text, post=self.post, author=self.author
+            )
+        url = reverse("blogger:api_comments", args=("other-post",))
+        data = self.client.get(url).json()
+        self.assertEqual([row["text"] for row in data["results"]], ["first", "second"])
+        self.assertEqual(data["results"][0]["author"], "user")
+
+    def test_author_profile(self):
+        data = self.client.get(reverse("blogger:api_author", args=("user",))).json()
+        self.assertEqual(data["username"], "user")
+        self.assertEqual(data["post_count"], 5)
+
+    def test_writes_are_not_allowed(self):
+        response = self.client.post(reverse("blogger:api_posts"))
+        self.assertEqual(response.status_code, 405)
+
+
+@override_settings(BLOGGER_PAGE_CACHE_TIMEOUT=300)
+class ApiCacheTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="user", password="top_secret")
+        self.author = Author.objects.get(user=user)
+        self.post = Post.objects.create(
+            title="Post", content="content", author=self.author
+        )
+
+    def test_responses_are_cached_until_purged(self):
+        url = reverse("blogger:api_comments", args=("post",))
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        Comment.objects.create(comment_text="new", post=self.post, author=self.author)
+        self.assertEqual(self.client.get(url).json()["results"][0]["text"], "new")
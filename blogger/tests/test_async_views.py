@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from django.test import TransactionTestCase, override_settings
+from django.core.cache import cache
+from django.urls import resolve, reverse
+from django.contrib.auth import get_user_model
+from blogger import async_views
+from blogger.bench import async_views as use_async_views
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+class AsyncViewsTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create(username="user", password="top_secret")
+        self.author = Author.objects.get(user=user)
+        self.post = Post.objects.create(
+            title="Async post", content="content", author=self.author
+        )
+        Comment.objects.create(
+            comment_text="async comment", post=self.post, author=self.author
+        )
+        context = use_async_views()
+        context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+
+    def test_setting_routes_read_views_to_async_views(self):
+        match = resolve(reverse("blogger:index"))
+        self.assertIs(match.func, async_views.index)
+        self.assertTrue(asyncio.iscoroutinefunction(match.func))
+
+    async def test_index(self):
+        response = await self.async_client.get(reverse("blogger:index"))
+        self.assertContains(response, "Async post")
+        self.assertContains(response, "1 comment")
+
+    async def test_view_post_loads_post_and_comments(self):
+        response = await self.async_client.get(self.post.get_absolute_url())
+        self.assertTemplateUsed(response, "blogger/view_post.html")
+        self.assertContains(response, "async comment")
+        self.assertTrue(response.has_header("ETag"))
+
+    async def test_view_post_of_missing_post_is_404(self):
+        url = reverse("blogger:view_post", args=("missing",))
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_unchanged_post_is_not_modified(self):
+        response = await self.async_client.get(self.post.get_absolute_url())
+        headers = [
+            (b"host", b"testserver"),
+            (b"if-none-match", response["ETag"].encode()),
+        ]
+        response = await self.async_client.get(
+            self.post.get_absolute_url(), headers=headers
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_view_blogger(self):
+        response = await self.async_client.get(
+            reverse("blogger:view_blogger", args=("user",))
+        )
+        self.assertEqual(response.context["author"], self.author)
+        self.assertContains(response, "Async post")
+
+    async def test_view_blogger_with_invalid_username(self):
+        response = await self.async_client.get(
+            reverse("blogger:view_blogger", args=("nobody",))
+        )
+        self.assertIsNone(response.context["author"])
+        self.assertIsNone(response.context["posts"])
+
+    @override_settings(BLOGGER_PAGE_CACHE_TIMEOUT=300)
+    async def test_anonymous_page_is_cached(self):
+        await self.async_client.get(reverse("blogger:index"))
+        await self.async_client.get(reverse("blogger:index"))
+        self.assertTrue(any(key for key in cache._cache if ":page:feed:" in key))
+
+    @override_settings(BLOGGER_PERFORMANCE_SAMPLE_RATE=1)
+    async def test_worker_thread_queries_are_counted(self):
+        with self.assertLogs("blogger.performance", "INFO") as logs:
+            response = await self.async_client.get(reverse("blogger:index"))
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["db_queries"], 2)
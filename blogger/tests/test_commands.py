@@ -0,0 +1,167 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.auth import get_user_model
+from accounts import urls as account_urls
+from blogger import search
+from blogger import urls as blogger_urls
+from blogger.bench import build_scenarios, percentile
+from blogger.management.commands.populate_db import NAMES
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+class ExplainQueriesCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        post = Post.objects.create(title="title", content="content", author=author)
+        Comment.objects.create(comment_text="comment", post=post, author=author)
+
+    def test_view_queries_do_not_scan_tables(self):
+        out = StringIO()
+        call_command("explain_queries", "--fail-on-scan", stdout=out)
+        self.assertIn("No full table scans found", out.getvalue())
+
+    def test_plan_is_printed_for_every_view(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        for view in ("index", "view_post", "view_blogger"):
+            self.assertIn(f"{view}:", out.getvalue())
+
+
+class RecountCommandTest(TestCase):
+    def test_drifted_counters_are_repaired(self):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        post = Post.objects.create(title="title", content="content", author=author)
+        empty = Post.objects.create(title="empty", content="content", author=author)
+        comments = [
+            Comment.objects.create(comment_text="comment", post=post, author=author)
+            for _ in range(3)
+        ]
+        Post.objects.update(comment_count=7, last_commented_at=None)
+
+        call_command("recount", "--batch-size", "1", stdout=StringIO())
+
+        post.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual(post.comment_count, 3)
+        self.assertEqual(post.last_commented_at, comments[-1].created)
+        self.assertEqual(empty.comment_count, 0)
+        self.assertIsNone(empty.last_commented_at)
+
+
+class PopulateDbCommandTest(TestCase):
+    def test_creates_requested_volumes(self):
+        call_command(
+            "populate_db",
+            "--authors=3",
+            "--posts-per-author=4",
+            "--comments-per-post=2",
+            "--batch-size=5",
+            stdout=StringIO(),
+        )
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 12)
+        self.assertEqual(Comment.objects.count(), 24)
+
+    def test_generated_posts_have_unique_slugs_and_counters(self):
+        call_command("populate_db", "--posts-per-author=3", stdout=StringIO())
+        slugs = Post.objects.values_list("title_slug", flat=True)
+        self.assertEqual(len(set(slugs)), len(slugs))
+        for post in Post.objects.all():
+            self.assertEqual(post.comment_count, 5)
+            self.assertEqual(post.last_commented_at, post.comment_set.last().created)
+
+    def test_posts_created_later_skip_generated_slugs(self):
+        call_command("populate_db", "--authors=1", stdout=StringIO())
+        generated = Post.objects.last()
+        base = generated.title_slug.rsplit("-", 1)[0]
+        post = Post.objects.create(
+            title=generated.title, content="content", author=generated.author
+        )
+        self.assertEqual(post.title_slug, f"{base}-{generated.id + 1}")
+
+    def test_can_run_repeatedly(self):
+        call_command("populate_db", stdout=StringIO())
+        call_command("populate_db", stdout=StringIO())
+        self.assertEqual(Author.objects.count(), 10)
+        self.assertEqual(Post.objects.count(), 50)
+
+    def test_generated_usernames_skip_existing_accounts(self):
+        first_id = len(NAMES) + 1
+        for name in NAMES:
+            User.objects.create(username=f"{name}{first_id}", password="top_secret")
+        call_command("populate_db", "--authors=1", stdout=StringIO())
+        username = User.objects.latest("id").username
+        self.assertEqual(username, Author.objects.latest("id").username)
+        self.assertEqual(User.objects.filter(username=username).count(), 1)
+        self.assertTrue(username.endswith("_"))
+
+    def test_search_index_is_extended_not_rebuilt(self):
+        call_command("populate_db", "--authors=1", stdout=StringIO())
+        with CaptureQueriesContext(connection) as queries:
+            call_command("populate_db", "--authors=1", stdout=StringIO())
+        statements = [query["sql"] for query in queries]
+        self.assertFalse([sql for sql in statements if sql.startswith("DELETE")])
+        for post in Post.objects.all():
+            self.assertIn(post, [hit.post for hit in search.search(post.title).hits])
+
+    def test_same_seed_generates_same_titles(self):
+        call_command("populate_db", "--seed=7", stdout=StringIO())
+        titles = list(Post.objects.order_by("id").values_list("title", flat=True))
+        Post.objects.all().delete()
+        call_command("populate_db", "--seed=7", stdout=StringIO())
+        again = list(Post.objects.order_by("id").values_list("title", flat=True))
+        self.assertEqual(titles, again)
+
+
+class BenchHelpersTest(TestCase):
+    def test_percentile_uses_nearest_rank(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(percentile(ordered, 0.50), 50)
+        self.assertEqual(percentile(ordered, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_scenarios_cover_every_named_url(self):
+        call_command("populate_db", "--authors=1", stdout=StringIO())
+        names = {scenario.name for scenario in build_scenarios()}
+        for pattern in blogger_urls.urlpatterns + account_urls.urlpatterns:
+            self.assertIn(pattern.name, names)
+
+
+class BackfillExcerptsCommandTest(TestCase):
+    def test_posts_without_summary_are_backfilled(self):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        for i in range(3):
+            Post.objects.create(title=f"t{i}", content="a b c", author=author)
+        Post.objects.update(excerpt="", word_count=0)
+
+        call_command("backfill_excerpts", "--batch-size=2", stdout=StringIO())
+
+        for post in Post.objects.all():
+            self.assertEqual(post.excerpt, "a b c")
+            self.assertEqual(post.word_count, 3)
+
+
+class RebuildSearchIndexCommandTest(TestCase):
+    def test_posts_and_comments_are_searchable_after_rebuild(self):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        post = Post.objects.create(title="Walrus", content="tusks", author=author)
+        Comment.objects.create(comment_text="blubber", post=post, author=author)
+        search.clear()
+        self.assertEqual(search.search("walrus").hits, [])
+
+        call_command("rebuild_search_index", "--batch-size=1", stdout=StringIO())
+
+        self.assertEqual(search.search("walrus").hits[0].post, post)
+        self.assertEqual(search.search("blubber").hits[0].kind, "comment")
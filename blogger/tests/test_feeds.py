@@ -0,0 +1,128 @@
+import hashlib
+from xml.etree import ElementTree
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from blogger.models import Post, Author
+
+User = get_user_model()
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def read(response):
+    return b"".join(response.streaming_content)
+
+
+class FeedTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+        other = User.objects.create(username="other", password="top_secret")
+        cls.other = Author.objects.get(user=other)
+        for i in range(3):
+            Post.objects.create(
+                title=f"Post {i}", content=f"<b>content {i}</b>", author=cls.author
+            )
+        Post.objects.create(title="Other post", content="content", author=cls.other)
+
+    def test_site_feed_is_streamed_atom(self):
+        response = self.client.get(reverse("blogger:feed"))
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("application/atom+xml"))
+        root = ElementTree.fromstring(read(response))
+        titles = [
+            entry.find(f"{ATOM}title").text for entry in root.iter(f"{ATOM}entry")
+        ]
+        self.assertEqual(titles, ["Other post", "Post 2", "Post 1", "Post 0"])
+
+    def test_entries_carry_link_author_and_escaped_excerpt(self):
+        root = ElementTree.fromstring(read(self.client.get(reverse("blogger:feed"))))
+        entry = root.find(f"{ATOM}entry")
+        self.assertEqual(
+            entry.find(f"{ATOM}link").get("href"),
+            "http://testserver/blogger/posts/other-post/",
+        )
+        self.assertEqual(entry.find(f"{ATOM}author/{ATOM}name").text, "other")
+        raw = read(self.client.get(reverse("blogger:feed")))
+        self.assertIn(b"&lt;b&gt;content 2&lt;/b&gt;", raw)
+
+    def test_rss_format(self):
+        response = self.client.get(reverse("blogger:feed"), {"format": "rss"})
+        self.assertTrue(response["Content-Type"].startswith("application/rss+xml"))
+        root = ElementTree.fromstring(read(response))
+        self.assertEqual(len(root.findall("channel/item")), 4)
+
+    @override_settings(BLOGGER_FEED_LENGTH=2)
+    def test_feed_is_bounded(self):
+        root = ElementTree.fromstring(read(self.client.get(reverse("blogger:feed"))))
+        self.assertEqual(len(root.findall(f"{ATOM}entry")), 2)
+
+    def test_author_feed_only_has_the_authors_posts(self):
+        url = reverse("blogger:author_feed", args=("user",))
+        root = ElementTree.fromstring(read(self.client.get(url)))
+        names = {name.text for name in root.iter(f"{ATOM}name")}
+        self.assertEqual(names, {"user"})
+        self.assertEqual(len(root.findall(f"{ATOM}entry")), 3)
+
+    def test_author_feed_of_unknown_author_is_404(self):
+        url = reverse("blogger:author_feed", args=("nobody",))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_unknown_author_is_404_even_with_the_empty_feed_etag(self):
+        url = reverse("blogger:author_feed", args=("nobody",))
+        empty_feed_etag = '"%s"' % hashlib.md5(b"atom").hexdigest()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=empty_feed_etag)
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_author_without_posts_has_a_feed(self):
+        User.objects.create(username="quiet", password="top_secret")
+        url = reverse("blogger:author_feed", args=("quiet",))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_unchanged_feed_costs_one_query(self):
+        url = reverse("blogger:feed")
+        response = self.client.get(url)
+        read(response)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_full_feed_costs_two_queries(self):
+        with self.assertNumQueries(2):
+            read(self.client.get(reverse("blogger:feed")))
+
+    def test_last_modified_is_newest_post_modification(self):
+        response = self.client.get(reverse("blogger:feed"))
+        response = self.client.get(
+            reverse("blogger:feed"), HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        url = reverse("blogger:author_feed", args=("user",))
+        etag = self.client.get(url)["ETag"]
+        post = Post.objects.filter(author=self.author).first()
+        post.content = "edited"
+        post.save()
+        self.assertNotEqual(self.client.get(url)["ETag"], etag)
+
+    def test_renaming_an_author_changes_etag(self):
+        url = reverse("blogger:feed")
+        etag = self.client.get(url)["ETag"]
+        user = self.other.user
+        user.username = "renamed"
+        user.save()
+        self.assertNotEqual(self.client.get(url)["ETag"], etag)
+
+    def test_formats_have_different_etags(self):
+        url = reverse("blogger:feed")
+        atom = self.client.get(url)["ETag"]
+        rss = self.client.get(url, {"format": "rss"})["ETag"]
+        self.assertNotEqual(atom, rss)
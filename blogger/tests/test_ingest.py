@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from blogger import ingest
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+class CommentBatcherTest(TransactionTestCase):
+    def setUp(self):
+        user = User.objects.create(username="user", password="top_secret")
+        self.author = Author.objects.get(user=user)
+        self.post = Post.objects.create(
+            title="title", content="content", author=self.author
+        )
+        self.batcher = ingest.CommentBatcher(delay=0.05, batch_size=50)
+        self.addCleanup(self.batcher.close)
+
+    def comment(self, text, post=None):
+        return Comment(comment_text=text, post=post or self.post, author=self.author)
+
+    def submit_concurrently(self, comments):
+        def submit(comment):
+            try:
+                return self.batcher.submit(comment, timeout=5)
+            except Exception as e:
+                return e
+            finally:
+                connection.close()
+
+        with self.assertLogs("blogger.ingest", "INFO"):
+            with ThreadPoolExecutor(max_workers=len(comments)) as executor:
+                return list(executor.map(submit, comments))
+
+    def test_burst_is_committed_in_few_transactions(self):
+        results = self.submit_concurrently([self.comment(f"c{i}") for i in range(20)])
+        self.assertTrue(all(isinstance(result, Comment) for result in results))
+        self.assertEqual(Comment.objects.count(), 20)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comment_count, 20)
+        stats = self.batcher.stats()
+        self.assertEqual(stats["comments"], 20)
+        self.assertLess(stats["batches"], 20)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_submit_returns_after_commit(self):
+        with self.assertLogs("blogger.ingest", "INFO") as logs:
+            comment = self.batcher.submit(self.comment("saved"), timeout=5)
+        self.assertTrue(Comment.objects.filter(pk=comment.pk).exists())
+        self.assertIn('"batch": 1', logs.output[0])
+
+    def test_bad_comment_only_fails_itself(self):
+        missing = Post(pk=self.post.pk + 1000, title_slug="missing")
+        results = self.submit_concurrently(
+            [
+                self.comment("good"),
+                self.comment("bad", post=missing),
+                self.comment("fine"),
+            ]
+        )
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual(
+            set(Comment.objects.values_list("comment_text", flat=True)),
+            {"good", "fine"},
+        )
+        self.assertEqual(self.batcher.stats()["failures"], 1)
+
+    @override_settings(BLOGGER_COMMENT_INGEST="grouped")
+    def test_add_comment_view_goes_through_the_batcher(self):
+        self.client.force_login(self.author.user)
+        self.addCleanup(ingest.get_batcher().close)
+        before = ingest.stats()["comments"]
+        with self.assertLogs("blogger.ingest", "INFO"):
+            response = self.client.post(
+                reverse("blogger:add_comment", args=(self.post.title_slug,)),
+                {"comment_text": "grouped"},
+            )
+        self.assertRedirects(response, self.post.get_absolute_url())
+        self.assertEqual(ingest.stats()["comments"], before + 1)
+        self.assertTrue(Comment.objects.filter(comment_text="grouped").exists())
+
+    @override_settings(
+        BLOGGER_COMMENT_INGEST="grouped", BLOGGER_COMMENT_INGEST_TIMEOUT=0.05
+    )
+    def test_comment_still_queued_after_the_timeout_is_accepted(self):
+        self.client.force_login(self.author.user)
+        slow = ingest.CommentBatcher(delay=0.5, batch_size=50)
+        with mock.patch.object(ingest, "get_batcher", return_value=slow):
+            with self.assertLogs("blogger.ingest", "INFO") as logs:
+                response = self.client.post(
+                    reverse("blogger:add_comment", args=(self.post.title_slug,)),
+                    {"comment_text": "slow"},
+                )
+                slow.close()
+        self.assertEqual(response.status_code, 202)
+        self.assertContains(response, "will appear shortly", status_code=202)
+        self.assertIn('"pending": true', logs.output[0])
+        self.assertEqual(Comment.objects.filter(comment_text="slow").count(), 1)
@@ -0,0 +1,88 @@
+import json
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from blogger.middleware import CurrentAuthorMiddleware
+from blogger.models import Post, Author
+
+User = get_user_model()
+
+
+@override_settings(BLOGGER_PERFORMANCE_SAMPLE_RATE=1)
+class PerformanceMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        cls.post = Post.objects.create(title="title", content="content", author=author)
+
+    def test_sampled_response_has_server_timing_header(self):
+        with self.assertLogs("blogger.performance", "INFO") as logs:
+            response = self.client.get(reverse("blogger:index"))
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "blogger:index")
+        self.assertEqual(record["db_queries"], 2)
+
+    def test_sampled_request_is_logged_as_json(self):
+        with self.assertLogs("blogger.performance", "INFO") as logs:
+            response = self.client.get(self.post.get_absolute_url())
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "blogger:view_post")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["db_queries"], 3)
+        self.assertGreater(record["template_ms"], 0)
+        self.assertEqual(record["response_bytes"], len(response.content))
+
+    @override_settings(BLOGGER_PERFORMANCE_SAMPLE_RATE=0)
+    def test_unsampled_response_has_no_server_timing_header(self):
+        response = self.client.get(reverse("blogger:index"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class CurrentAuthorMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+        cls.post = Post.objects.create(
+            title="title", content="content", author=cls.author
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_author_is_looked_up_once_across_requests(self):
+        self.client.force_login(self.author.user)
+        url = reverse("blogger:add_comment", args=(self.post.title_slug,))
+        self.client.post(url, {"comment_text": "first"})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url, {"comment_text": "second"})
+        self.assertFalse([q for q in queries if 'FROM "blogger_author"' in q["sql"]])
+        comment = self.post.comment_set.get(comment_text="second")
+        self.assertEqual(comment.author, self.author)
+
+    def test_anonymous_visitors_have_no_author(self):
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        CurrentAuthorMiddleware(lambda request: None)(request)
+        self.assertFalse(request.author)
+
+    def test_author_is_not_looked_up_unless_used(self):
+        request = RequestFactory().get("/")
+        request.user = self.author.user
+        with self.assertNumQueries(0):
+            CurrentAuthorMiddleware(lambda request: None)(request)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_signed_cookie_session_costs_only_the_user_query(self):
+        self.client.force_login(self.author.user)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("blogger:add_post"))
+        self.assertEqual(response.status_code, 200)
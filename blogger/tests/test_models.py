@@ -1,8 +1,14 @@
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from blogger.models import Post, Author, Comment
+from blogger.models import EXCERPT_LENGTH, Post, Author, Comment
 from django.urls import reverse
+from django.db import connection
 from django.db.utils import IntegrityError
+from django.test.utils import CaptureQueriesContext
 
 User = get_user_model()
 
@@ -71,9 +77,48 @@ class PostModelTest(TestCase):
         self.assertEqual(post.title_slug, "my-title")
 
     def test_slugified_title_is_unique(self):
-        Post.objects.create(title="title's", content="content", author=self.author)
-        with self.assertRaises(IntegrityError):
-            Post.objects.create(title="titles", content="content", author=self.author)
+        first = Post.objects.create(
+            title="title's", content="content", author=self.author
+        )
+        second = Post.objects.create(
+            title="titles", content="content", author=self.author
+        )
+        self.assertEqual(first.title_slug, "titles")
+        self.assertEqual(second.title_slug, "titles-2")
+
+    def test_common_title_gets_slug_in_bounded_queries(self):
+        def create():
+            with CaptureQueriesContext(connection) as queries:
+                post = Post.objects.create(
+                    title="Hello", content="content", author=self.author
+                )
+            return post, len(queries)
+
+        create()
+        _, second_post_queries = create()
+        for _ in range(20):
+            post, queries = create()
+        self.assertEqual(post.title_slug, "hello-22")
+        self.assertEqual(queries, second_post_queries)
+
+    def test_slug_taken_by_another_title_is_skipped(self):
+        Post.objects.create(title="hello", content="content", author=self.author)
+        Post.objects.create(title="hello 2", content="content", author=self.author)
+        post = Post.objects.create(title="Hello", content="content", author=self.author)
+        self.assertEqual(post.title_slug, "hello-3")
+
+    def test_slug_is_stable_when_title_is_edited(self):
+        post = Post.objects.create(
+            title="My title", content="content", author=self.author
+        )
+        url = post.get_absolute_url()
+        post.title = "Another title"
+        post.save()
+        self.assertEqual(post.get_absolute_url(), url)
+
+    def test_title_without_slug_characters_gets_fallback_slug(self):
+        post = Post.objects.create(title="!!!", content="content", author=self.author)
+        self.assertEqual(post.title_slug, "post")
 
 
 class AuthorModelTest(TestCase):
@@ -88,6 +133,29 @@ class AuthorModelTest(TestCase):
         author = Author.objects.get(user=user)
         self.assertEqual(str(author), author.user.username)
 
+    def test_username_follows_renamed_user(self):
+        user = User.objects.create(username="user", password="top_secret")
+        user.username = "renamed"
+        user.save()
+        self.assertEqual(Author.objects.get(user=user).username, "renamed")
+
+    def test_saving_other_user_fields_does_not_touch_author(self):
+        user = User.objects.create(username="user", password="top_secret")
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+    def test_migration_copies_usernames_in_batches(self):
+        migration = import_module("blogger.migrations.0010_copy_author_usernames")
+        for i in range(3):
+            User.objects.create(username=f"user{i}", password="top_secret")
+        Author.objects.update(username="")
+        with mock.patch.object(migration, "BATCH_SIZE", 2):
+            migration.copy_usernames(apps, connection.schema_editor())
+        self.assertEqual(
+            sorted(Author.objects.values_list("username", flat=True)),
+            ["user0", "user1", "user2"],
+        )
+
 
 class CommentModelTest(TestCase):
     def test_valid_data_creates_comment(self):
@@ -127,4 +195,79 @@ class CommentModelTest(TestCase):
         )
         comments = Comment.objects.all()
         self.assertEqual(comment1, comments[0])
-        self.assertEqual(comment2, comments[1])
\ No newline at end of file
+        self.assertEqual(comment2, comments[1])
+
+
+class PostCommentCounterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            title="title", content="content", author=self.author
+        )
+
+    def test_new_post_has_no_comments(self):
+        self.assertEqual(self.post.comment_count, 0)
+        self.assertIsNone(self.post.last_commented_at)
+
+    def test_creating_comment_updates_counters(self):
+        comment = Comment.objects.create(
+            comment_text="comment", post=self.post, author=self.author
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.last_commented_at, comment.created)
+
+    def test_deleting_comment_updates_counters(self):
+        first = Comment.objects.create(
+            comment_text="comment", post=self.post, author=self.author
+        )
+        second = Comment.objects.create(
+            comment_text="comment", post=self.post, author=self.author
+        )
+        second.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.last_commented_at, first.created)
+
+    def test_deleting_last_comment_clears_last_commented_at(self):
+        comment = Comment.objects.create(
+            comment_text="comment", post=self.post, author=self.author
+        )
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+        self.assertIsNone(self.post.last_commented_at)
+
+
+class PostSummaryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+
+    def test_excerpt_and_word_count_are_stored_on_save(self):
+        post = Post.objects.create(
+            title="title", content="one two\nthree", author=self.author
+        )
+        self.assertEqual(post.excerpt, "one two three")
+        self.assertEqual(post.word_count, 3)
+
+    def test_excerpt_is_length_bounded(self):
+        post = Post.objects.create(
+            title="title", content="word " * 5000, author=self.author
+        )
+        self.assertLessEqual(len(post.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(post.excerpt.endswith("…"))
+        self.assertEqual(post.word_count, 5000)
+        self.assertEqual(post.reading_time, 25)
+
+    def test_excerpt_is_updated_on_edit(self):
+        post = Post.objects.create(title="title", content="old", author=self.author)
+        post.content = "new content"
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, "new content")
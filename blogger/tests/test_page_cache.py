@@ -0,0 +1,91 @@
+from django.test import TransactionTestCase, override_settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+@override_settings(BLOGGER_PAGE_CACHE_TIMEOUT=300)
+class AnonymousPageCacheTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="user", password="top_secret")
+        self.author = Author.objects.get(user=self.user)
+        self.post = Post.objects.create(
+            title="Cached post", content="content", author=self.author
+        )
+
+    def test_repeated_anonymous_request_is_served_from_cache(self):
+        self.client.get(reverse("blogger:index"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("blogger:index"))
+        self.assertContains(response, "Cached post")
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.get(reverse("blogger:view_post", args=("cached-post",)))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("blogger:view_post", args=("cached-post",)))
+        self.assertContains(response, "edit")
+
+    def test_new_post_purges_feed_and_author_pages(self):
+        self.client.get(reverse("blogger:index"))
+        self.client.get(reverse("blogger:view_blogger", args=("user",)))
+        Post.objects.create(title="fresh", content="content", author=self.author)
+        self.assertContains(self.client.get(reverse("blogger:index")), "fresh")
+        self.assertContains(
+            self.client.get(reverse("blogger:view_blogger", args=("user",))), "fresh"
+        )
+
+    def test_signing_up_purges_the_author_not_found_page(self):
+        url = reverse("blogger:view_blogger", args=("newcomer",))
+        self.assertContains(self.client.get(url), "No Author Found")
+        User.objects.create(username="newcomer", password="top_secret")
+        self.assertNotContains(self.client.get(url), "No Author Found")
+
+    def test_renaming_a_user_purges_both_author_pages(self):
+        old_url = reverse("blogger:view_blogger", args=("user",))
+        new_url = reverse("blogger:view_blogger", args=("renamed",))
+        self.assertContains(self.client.get(old_url), "Cached post")
+        self.assertContains(self.client.get(new_url), "No Author Found")
+        self.user.username = "renamed"
+        self.user.save()
+        self.assertContains(self.client.get(old_url), "No Author Found")
+        self.assertContains(self.client.get(new_url), "Cached post")
+
+    def test_renaming_a_user_purges_the_feed_and_their_post_pages(self):
+        post_url = reverse("blogger:view_post", args=("cached-post",))
+        self.client.get(reverse("blogger:index"))
+        self.client.get(post_url)
+        self.user.username = "renamed"
+        self.user.save()
+        renamed_url = reverse("blogger:view_blogger", args=("renamed",))
+        self.assertContains(self.client.get(reverse("blogger:index")), renamed_url)
+        self.assertContains(self.client.get(post_url), renamed_url)
+
+    def test_new_comment_purges_post_page(self):
+        url = reverse("blogger:view_post", args=("cached-post",))
+        self.client.get(url)
+        Comment.objects.create(
+            comment_text="first comment", post=self.post, author=self.author
+        )
+        self.assertContains(self.client.get(url), "first comment")
+
+    def test_unrelated_post_page_stays_cached(self):
+        other = Post.objects.create(
+            title="other", content="content", author=self.author
+        )
+        url = reverse("blogger:view_post", args=(other.title_slug,))
+        self.client.get(url)
+        Comment.objects.create(
+            comment_text="comment", post=self.post, author=self.author
+        )
+        # Only the conditional GET validator query runs.
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_deleted_post_disappears_from_feed(self):
+        self.client.get(reverse("blogger:index"))
+        self.post.delete()
+        self.assertNotContains(self.client.get(reverse("blogger:index")), "Cached post")
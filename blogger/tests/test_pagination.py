@@ -0,0 +1,49 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from blogger.models import Post, Author
+from blogger.pagination import (
+    CursorPaginator,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+User = get_user_model()
+
+
+class CursorTokenTest(TestCase):
+    def test_encoded_cursor_round_trips(self):
+        token = encode_cursor("2020-10-01T16:20:00+00:00", 42)
+        self.assertEqual(decode_cursor(token, 2), ["2020-10-01T16:20:00+00:00", "42"])
+
+    def test_malformed_cursor_raises_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not base64!", 2)
+
+    def test_cursor_with_wrong_length_raises_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor("a", "b", "c"), 2)
+
+
+class CursorPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        cls.posts = [
+            Post.objects.create(title=f"title{i}", content="content", author=author)
+            for i in range(5)
+        ]
+
+    def test_ascending_pages_follow_creation_order(self):
+        paginator = CursorPaginator(Post.objects.all(), 2, descending=False)
+        first = paginator.get_page(None)
+        second = paginator.get_page(first.next_cursor)
+        self.assertEqual(list(first), self.posts[:2])
+        self.assertEqual(list(second), self.posts[2:4])
+
+    def test_last_page_has_no_next_cursor(self):
+        paginator = CursorPaginator(Post.objects.all(), 5)
+        page = paginator.get_page(None)
+        self.assertFalse(page.has_next())
+        self.assertIsNone(page.next_cursor)
@@ -0,0 +1,52 @@
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from blogger import render_cache
+from blogger.models import Post, Author
+
+User = get_user_model()
+
+
+class RenderCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            title="title", content="<b>line1</b>\nline2", author=self.author
+        )
+
+    def test_body_is_escaped_and_line_broken(self):
+        body = render_cache.render_body(self.post)
+        self.assertEqual(body, "&lt;b&gt;line1&lt;/b&gt;<br>line2")
+
+    @override_settings(BLOGGER_RENDER_CACHE_STATS=True)
+    def test_second_render_is_a_hit(self):
+        render_cache.render_body(self.post)
+        render_cache.render_body(self.post)
+        self.assertEqual(render_cache.stats()["hits"], 1)
+        self.assertEqual(render_cache.stats()["misses"], 1)
+
+    def test_saving_post_invalidates_cached_body(self):
+        render_cache.render_body(self.post)
+        old_key = render_cache.body_key(self.post.pk, self.post.modified)
+        self.post.content = "changed"
+        self.post.save()
+        self.assertIsNone(cache.get(old_key))
+        self.assertEqual(render_cache.render_body(self.post), "changed")
+
+    def test_lookups_are_not_counted_by_default(self):
+        render_cache.render_body(self.post)
+        render_cache.render_body(self.post)
+        self.assertEqual(render_cache.stats()["misses"], 0)
+        self.assertEqual(render_cache.stats()["hits"], 0)
+
+    @override_settings(BLOGGER_RENDER_CACHE_STATS=True)
+    def test_view_post_renders_cached_body(self):
+        self.client.get(self.post.get_absolute_url())
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, "&lt;b&gt;line1&lt;/b&gt;<br>line2")
+        self.assertEqual(render_cache.stats()["hits"], 1)
@@ -0,0 +1,126 @@
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from blogger import routers
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+@override_settings(BLOGGER_READ_DATABASES=["replica"])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+
+    def on_replica(self):
+        token = routers._read_database.set("replica")
+        self.addCleanup(routers._read_database.reset, token)
+
+    def test_reads_use_the_primary_outside_replica_views(self):
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_blogger_reads_use_the_replica_inside_replica_views(self):
+        self.on_replica()
+        self.assertEqual(self.router.db_for_read(Post), "replica")
+        self.assertEqual(self.router.db_for_read(Comment), "replica")
+
+    def test_users_and_sessions_are_always_read_from_the_primary(self):
+        self.on_replica()
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_writes_always_use_the_primary(self):
+        self.on_replica()
+        self.assertEqual(self.router.db_for_write(Post), "default")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(self.router.allow_migrate("replica", "blogger"), False)
+        self.assertIsNone(self.router.allow_migrate("default", "blogger"))
+
+
+@override_settings(BLOGGER_READ_DATABASES=["replica"])
+class ReadFromReplicaTest(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        user = User.objects.create(username="user", password="top_secret")
+        self.author = Author.objects.get(user=user)
+        self.post = Post.objects.create(
+            title="title", content="content", author=self.author
+        )
+
+    def replica_queries(self, url, method="get", data=None):
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = getattr(self.client, method)(url, data)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        return response, len(queries)
+
+    def test_read_views_use_the_replica(self):
+        for url in (
+            reverse("blogger:index"),
+            self.post.get_absolute_url(),
+            reverse("blogger:view_blogger", args=("user",)),
+            reverse("blogger:api_posts"),
+            reverse("blogger:search") + "?q=title",
+        ):
+            with self.subTest(url=url):
+                response, queries = self.replica_queries(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(queries, 0)
+
+    def test_streamed_feed_reads_from_the_replica(self):
+        response, queries = self.replica_queries(reverse("blogger:feed"))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(queries, 0)
+
+    def test_writes_go_to_the_primary_and_stick(self):
+        self.client.force_login(self.author.user)
+        url = reverse("blogger:add_comment", args=(self.post.title_slug,))
+        response, queries = self.replica_queries(url, "post", {"comment_text": "new"})
+        self.assertEqual(queries, 0)
+        self.assertTrue(Comment.objects.filter(comment_text="new").exists())
+        cookie = response.cookies[routers.STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], 30)
+        self.assertTrue(cookie["httponly"])
+
+        response, queries = self.replica_queries(self.post.get_absolute_url())
+        self.assertContains(response, "new")
+        self.assertEqual(queries, 0)
+
+    @override_settings(BLOGGER_PAGE_CACHE_TIMEOUT=300)
+    def test_page_read_from_replica_right_after_a_purge_is_not_cached(self):
+        cache.clear()
+        Comment.objects.create(comment_text="new", post=self.post, author=self.author)
+        url = self.post.get_absolute_url()
+        _, first = self.replica_queries(url)
+        _, second = self.replica_queries(url)
+        self.assertEqual(second, first)
+
+    @override_settings(BLOGGER_PAGE_CACHE_TIMEOUT=300, BLOGGER_REPLICA_STICKY_SECONDS=0)
+    def test_page_read_from_replica_is_cached_once_replicas_caught_up(self):
+        cache.clear()
+        url = self.post.get_absolute_url()
+        _, first = self.replica_queries(url)
+        _, second = self.replica_queries(url)
+        # Only the conditional GET validators run on a cache hit.
+        self.assertLess(second, first)
+
+    @override_settings(BLOGGER_READ_DATABASES=[])
+    def test_nothing_changes_without_replicas(self):
+        self.client.force_login(self.author.user)
+        url = reverse("blogger:add_comment", args=(self.post.title_slug,))
+        response = self.client.post(url, {"comment_text": "new"})
+        self.assertNotIn(routers.STICKY_COOKIE, response.cookies)
+        _, queries = self.replica_queries(reverse("blogger:index"))
+        self.assertEqual(queries, 0)
+
+
+class SyncReplicasCommandTest(SimpleTestCase):
+    def test_requires_replicas(self):
+        with self.assertRaises(CommandError):
+            call_command("sync_replicas")
@@ -0,0 +1,119 @@
+from django.test import TestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from blogger import search
+from blogger.models import Post, Author, Comment
+
+User = get_user_model()
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+        cls.post = Post.objects.create(
+            title="Walrus facts", content="Walruses have tusks.", author=cls.author
+        )
+
+    def test_backend_is_fts5_on_sqlite(self):
+        self.assertTrue(search.uses_fts())
+
+    def test_post_is_found_by_title_and_content(self):
+        self.assertEqual(search.search("walrus").hits[0].post, self.post)
+        self.assertEqual(search.search("tusks").hits[0].post, self.post)
+
+    def test_edited_post_is_reindexed(self):
+        post = Post.objects.create(title="Otter", content="old", author=self.author)
+        post.content = "whiskers"
+        post.save()
+        self.assertEqual(search.search("old").hits, [])
+        self.assertEqual(search.search("whiskers").hits[0].post, post)
+
+    def test_comment_hit_points_to_its_post(self):
+        Comment.objects.create(
+            comment_text="Blubber is warm", post=self.post, author=self.author
+        )
+        hit = search.search("blubber").hits[0]
+        self.assertEqual(hit.post, self.post)
+        self.assertEqual(hit.kind, "comment")
+        self.assertIn("<mark>Blubber</mark>", hit.snippet)
+
+    def test_deleted_rows_are_removed(self):
+        post = Post.objects.create(title="Seal", content="flippers", author=self.author)
+        Comment.objects.create(comment_text="barking", post=post, author=self.author)
+        post.delete()
+        self.assertEqual(search.search("flippers").hits, [])
+        self.assertEqual(search.search("barking").hits, [])
+
+    def test_rows_deleted_by_a_cascade_are_removed(self):
+        user = User.objects.create(username="other", password="top_secret")
+        author = Author.objects.get(user=user)
+        post = Post.objects.create(title="Otter", content="whiskers", author=author)
+        Comment.objects.create(comment_text="holding paws", post=post, author=author)
+        Comment.objects.create(comment_text="paws", post=self.post, author=author)
+        user.delete()
+        self.assertEqual(search.search("whiskers").hits, [])
+        self.assertEqual(search.search("paws"), search.SearchResults([], None))
+
+    def test_rows_deleted_with_a_queryset_are_removed(self):
+        for i in range(3):
+            Comment.objects.create(
+                comment_text=f"krill {i}", post=self.post, author=self.author
+            )
+        Comment.objects.filter(comment_text__in=["krill 0", "krill 1"]).delete()
+        results = search.search("krill", limit=1)
+        self.assertEqual(len(results.hits), 1)
+        self.assertIsNone(results.next_cursor)
+
+    def test_deleting_a_post_does_not_load_its_comments(self):
+        post = Post.objects.create(title="Orca", content="pod", author=self.author)
+        for i in range(30):
+            Comment.objects.create(
+                comment_text=f"dorsal {i}", post=post, author=self.author
+            )
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        self.assertLess(len(queries), 10)
+        self.assertEqual(search.search("dorsal").hits, [])
+
+    def test_snippet_is_escaped(self):
+        Post.objects.create(
+            title="Markup", content="<script>narwhal</script>", author=self.author
+        )
+        snippet = search.search("narwhal").hits[0].snippet
+        self.assertNotIn("<script>", snippet)
+        self.assertIn("&lt;script&gt;", snippet)
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(search.search('"walrus*').hits[0].post, self.post)
+        self.assertEqual(search.search("*** ").hits, [])
+
+    def test_results_are_paged_with_a_cursor(self):
+        for i in range(3):
+            Post.objects.create(title=f"Puffin {i}", content="beak", author=self.author)
+        first = search.search("puffin", limit=2)
+        second = search.search("puffin", cursor=first.next_cursor, limit=2)
+        self.assertEqual(len(first.hits), 2)
+        self.assertEqual(len(second.hits), 1)
+        self.assertIsNone(second.next_cursor)
+        seen = {hit.post.pk for hit in first.hits + second.hits}
+        self.assertEqual(len(seen), 3)
+
+    @override_settings(BLOGGER_SEARCH_BACKEND="basic")
+    def test_basic_backend_searches_posts_and_comments(self):
+        Comment.objects.create(comment_text="ivory", post=self.post, author=self.author)
+        self.assertEqual(search.search("tusks").hits[0].post, self.post)
+        self.assertEqual(search.search("ivory").hits[0].post, self.post)
+
+    def test_search_view(self):
+        response = self.client.get(reverse("blogger:search"), {"q": "walrus"})
+        self.assertTemplateUsed(response, "blogger/search.html")
+        self.assertContains(response, self.post.get_absolute_url())
+
+    def test_search_view_without_query(self):
+        response = self.client.get(reverse("blogger:search"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["results"].hits, [])
@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase, override_settings
+from django.db import connection, connections
+from blogger import sqlite
+
+
+class SqliteProfileTest(SimpleTestCase):
+    databases = {"default"}
+
+    def pragmas(self, *names):
+        # A fresh connection, so connection_created fires under the
+        # settings of the test.
+        wrapper = type(connections["default"])(
+            connection.settings_dict.copy(), "default"
+        )
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            values = []
+            for name in names:
+                cursor.execute(f"PRAGMA {name}")
+                values.append(cursor.fetchone()[0])
+        return values
+
+    @override_settings(BLOGGER_SQLITE_PROFILE="production")
+    def test_production_profile_is_applied_to_new_connections(self):
+        self.assertEqual(
+            self.pragmas("busy_timeout", "cache_size", "temp_store", "synchronous"),
+            [5000, -16384, 2, 1],
+        )
+
+    @override_settings(BLOGGER_SQLITE_PROFILE="default")
+    def test_default_profile_leaves_sqlite_defaults(self):
+        self.assertEqual(self.pragmas("temp_store", "synchronous"), [0, 2])
+
+    def test_every_profile_is_known(self):
+        for profile in ("default", "production"):
+            with override_settings(BLOGGER_SQLITE_PROFILE=profile):
+                self.assertIs(sqlite.get_pragmas(), sqlite.PROFILES[profile])
@@ -1,4 +1,7 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.db import connection
 from django.urls import resolve, reverse
 from django.http import HttpResponse
 from django.contrib.auth import get_user_model
@@ -260,7 +263,7 @@ class EditPostViewTest(TestCase):
             reverse("blogger:edit_post", args=(self.post.title_slug,)),
             data={"title": "my title", "content": "my content"},
         )
-        self.assertRedirects(response, "/blogger/posts/my-title/")
+        self.assertRedirects(response, "/blogger/posts/title/")
 
     def test_unauthenticated_users_are_redirected_to_login_page(self):
         response = self.client.post(
@@ -414,3 +417,302 @@ class AddCommentViewTest(TestCase):
             response,
             f"/accounts/login/?next=/blogger/posts/{self.post.title_slug}/comment/",
         )
+
+
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create(username=f"user{i}", password="top_secret")
+            for i in range(3)
+        ]
+        cls.authors = [Author.objects.get(user=user) for user in users]
+        for i in range(12):
+            post = Post.objects.create(
+                title=f"title{i}", content="content", author=cls.authors[i % 3]
+            )
+            for author in cls.authors:
+                Comment.objects.create(comment_text="comment", post=post, author=author)
+        cls.post = post
+
+    def test_index_uses_fixed_number_of_queries(self):
+        with self.assertNumQueries(2):
+            self.client.get(reverse("blogger:index"))
+
+    def test_index_second_page_uses_fixed_number_of_queries(self):
+        with self.assertNumQueries(2):
+            self.client.get(reverse("blogger:index"), {"page": 2})
+
+    def test_view_post_uses_fixed_number_of_queries(self):
+        with self.assertNumQueries(3):
+            self.client.get(reverse("blogger:view_post", args=(self.post.title_slug,)))
+
+    def test_view_blogger_uses_fixed_number_of_queries(self):
+        url = reverse("blogger:view_blogger", args=(self.authors[0],))
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_view_blogger_with_invalid_username_uses_two_queries(self):
+        with self.assertNumQueries(2):
+            self.client.get(reverse("blogger:view_blogger", args=("nonuser",)))
+
+
+@override_settings(BLOGGER_PAGINATION="cursor")
+class CursorPaginationViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=user)
+        cls.posts = [
+            Post.objects.create(title=f"title{i}", content="content", author=cls.author)
+            for i in range(25)
+        ]
+
+    def test_first_page_contains_newest_posts(self):
+        response = self.client.get(reverse("blogger:index"))
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(page_obj), self.posts[::-1][:10])
+        self.assertTrue(page_obj.has_next())
+        self.assertFalse(page_obj.has_previous())
+
+    def test_following_cursors_walks_every_post_once(self):
+        seen = []
+        params = {}
+        while True:
+            response = self.client.get(reverse("blogger:index"), params)
+            page_obj = response.context["page_obj"]
+            seen.extend(page_obj)
+            if not page_obj.has_next():
+                break
+            params = {"after": page_obj.next_cursor}
+        self.assertEqual(seen, self.posts[::-1])
+
+    def test_next_link_is_rendered(self):
+        response = self.client.get(reverse("blogger:index"))
+        next_cursor = response.context["page_obj"].next_cursor
+        self.assertContains(response, f"?after={next_cursor}")
+
+    def test_invalid_cursor_returns_first_page(self):
+        response = self.client.get(reverse("blogger:index"), {"after": "garbage"})
+        self.assertEqual(list(response.context["page_obj"]), self.posts[::-1][:10])
+
+    def test_index_does_not_count_posts(self):
+        with self.assertNumQueries(1):
+            self.client.get(reverse("blogger:index"))
+
+    def test_view_blogger_is_paginated(self):
+        url = reverse("blogger:view_blogger", args=("user",))
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(list(response.context["posts"]), self.posts[::-1][:10])
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="user", password="top_secret")
+        cls.author = Author.objects.get(user=cls.user)
+        cls.post = Post.objects.create(
+            title="title", content="content", author=cls.author
+        )
+
+    def test_view_post_sends_validators(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_view_post_returns_304_for_matching_etag(self):
+        url = self.post.get_absolute_url()
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_view_post_returns_304_when_not_modified_since(self):
+        url = self.post.get_absolute_url()
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_comment_changes_post_etag(self):
+        url = self.post.get_absolute_url()
+        etag = self.client.get(url)["ETag"]
+        Comment.objects.create(
+            comment_text="comment", post=self.post, author=self.author
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_renaming_the_author_changes_post_etag(self):
+        url = self.post.get_absolute_url()
+        etag = self.client.get(url)["ETag"]
+        self.user.username = "renamed"
+        self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "renamed")
+
+    def test_etag_differs_per_user(self):
+        url = self.post.get_absolute_url()
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_view_blogger_returns_304_for_matching_etag(self):
+        url = reverse("blogger:view_blogger", args=("user",))
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleted_post_changes_profile_etag(self):
+        other = Post.objects.create(
+            title="other", content="content", author=self.author
+        )
+        url = reverse("blogger:view_blogger", args=("user",))
+        etag = self.client.get(url)["ETag"]
+        other.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_author_page_has_no_etag(self):
+        url = reverse("blogger:view_blogger", args=("newbie",))
+        response = self.client.get(url)
+        self.assertContains(response, "No Author Found")
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_deleted_author_changes_profile_etag(self):
+        User.objects.create(username="newbie", password="top_secret")
+        url = reverse("blogger:view_blogger", args=("newbie",))
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        User.objects.get(username="newbie").delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "No Author Found")
+
+
+class PermalinkResolutionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="user", password="top_secret")
+        cls.other = User.objects.create(username="other", password="top_secret")
+        author = Author.objects.get(user=cls.user)
+        cls.post = Post.objects.create(title="title", content="content", author=author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unknown_slug_returns_404(self):
+        self.client.force_login(self.user)
+        for name in ("view_post", "edit_post", "delete_post", "add_comment"):
+            response = self.client.post(reverse(f"blogger:{name}", args=("nothing",)))
+            self.assertEqual(response.status_code, 404)
+
+    def test_cached_permalink_skips_post_read_for_other_users(self):
+        self.client.force_login(self.other)
+        url = reverse("blogger:edit_post", args=(self.post.title_slug,))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, "You cannot edit this post")
+        self.assertFalse(
+            any("blogger_post" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_delete_confirmation_does_not_load_content(self):
+        self.client.force_login(self.user)
+        url = reverse("blogger:delete_post", args=(self.post.title_slug,))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse(
+            any('"content"' in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_deleted_post_is_no_longer_resolved(self):
+        self.client.force_login(self.user)
+        url = reverse("blogger:edit_post", args=(self.post.title_slug,))
+        self.client.get(url)
+        Post.objects.get(pk=self.post.pk).delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ListingColumnsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="user", password="top_secret")
+        author = Author.objects.get(user=user)
+        Post.objects.create(title="title", content="x" * 10000, author=author)
+
+    def assertContentNotSelected(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        for query in queries.captured_queries:
+            self.assertNotIn('"blogger_post"."content"', query["sql"])
+        return response
+
+    def test_index_does_not_load_post_content(self):
+        response = self.assertContentNotSelected(reverse("blogger:index"))
+        self.assertContains(response, '<a href="/blogger/bloggers/user/">user</a>')
+
+    def test_view_blogger_does_not_load_post_content(self):
+        self.assertContentNotSelected(reverse("blogger:view_blogger", args=("user",)))
+
+    @override_settings(BLOGGER_PAGINATION="cursor")
+    def test_cursor_pages_do_not_load_post_content(self):
+        self.assertContentNotSelected(reverse("blogger:index"))
+
+
+@override_settings(BLOGGER_COMMENTS_PER_PAGE=3)
+class CommentPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create(username=f"user{i}", password="top_secret")
+            for i in range(2)
+        ]
+        cls.authors = [Author.objects.get(user=user) for user in users]
+        cls.post = Post.objects.create(
+            title="Busy post", content="content", author=cls.authors[0]
+        )
+        cls.comments = [
+            Comment.objects.create(
+                comment_text=f"comment {i}", post=cls.post, author=cls.authors[i % 2]
+            )
+            for i in range(7)
+        ]
+
+    def test_view_post_shows_first_page_of_comments(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertEqual(list(response.context["comments"]), self.comments[:3])
+        self.assertContains(response, "More comments")
+
+    def test_comments_fragment_continues_the_thread(self):
+        response = self.client.get(self.post.get_absolute_url())
+        cursor = response.context["comments"].next_cursor
+        url = reverse("blogger:comments", args=(self.post.title_slug,))
+        response = self.client.get(url, {"after": cursor})
+        self.assertTemplateUsed(response, "blogger/comment_list.html")
+        self.assertTemplateNotUsed(response, "blogger/base.html")
+        self.assertEqual(list(response.context["comments"]), self.comments[3:6])
+
+    def test_last_page_has_no_more_link(self):
+        url = reverse("blogger:comments", args=(self.post.title_slug,))
+        cursor = None
+        for _ in range(3):
+            response = self.client.get(url, {"after": cursor} if cursor else {})
+            cursor = response.context["comments"].next_cursor
+        self.assertEqual(list(response.context["comments"]), self.comments[6:])
+        self.assertNotContains(response, "More comments")
+
+    def test_view_post_query_count_does_not_grow_with_comments(self):
+        with self.assertNumQueries(3):
+            self.client.get(self.post.get_absolute_url())
+
+    def test_comments_fragment_uses_fixed_number_of_queries(self):
+        url = reverse("blogger:comments", args=(self.post.title_slug,))
+        self.client.get(url)
+        # The validator query and the page of comments; the slug is cached.
+        with self.assertNumQueries(2):
+            self.client.get(url)
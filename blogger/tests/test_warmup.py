@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase, override_settings
+from django.template import engines
+from blogger import bench, warmup
+
+
+class WarmupTest(SimpleTestCase):
+    def test_template_names_cover_blogger_and_registration(self):
+        names = warmup.template_names()
+        self.assertIn("blogger/base.html", names)
+        self.assertIn("registration/login.html", names)
+        self.assertFalse([name for name in names if name.startswith("admin/")])
+
+    @override_settings(TEMPLATES=bench.template_settings("production"))
+    def test_templates_are_compiled_into_the_cached_loader(self):
+        with self.assertLogs("blogger.performance", "INFO"):
+            warmup.run()
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertTrue(set(warmup.template_names()) <= set(loader.get_template_cache))
+
+    def test_debug_mode_does_not_cache_templates(self):
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertFalse(hasattr(loader, "get_template_cache"))
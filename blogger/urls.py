@@ -1,13 +1,24 @@
+from django.conf import settings
 from django.urls import path, re_path
-from blogger import views
+from blogger import api, async_views, views
+
+read_views = async_views if getattr(settings, "BLOGGER_ASYNC_VIEWS", False) else views
 
 app_name = "blogger"
 urlpatterns = [
-    path("", views.index, name="index"),
+    path("", read_views.index, name="index"),
+    path("feed/", views.feed, name="feed"),
+    path("search/", views.search, name="search"),
     path("posts/add/", views.add, name="add_post"),
-    re_path(r"^posts/([\w\d\-]+)/$", views.view_post, name="view_post"),
+    re_path(r"^posts/([\w\d\-]+)/$", read_views.view_post, name="view_post"),
     re_path(r"^posts/([\w\d\-]+)/edit/$", views.edit_post, name="edit_post"),
     re_path(r"^posts/([\w\d\-]+)/delete/$", views.delete_post, name="delete_post"),
     re_path(r"^posts/([\w\d\-]+)/comment/$", views.add_comment, name="add_comment"),
-    re_path(r"^bloggers/([\w\d\-]+)/$", views.view_blogger, name="view_blogger"),
+    re_path(r"^posts/([\w\d\-]+)/comments/$", views.comment_list, name="comments"),
+    re_path(r"^bloggers/([\w\d\-]+)/$", read_views.view_blogger, name="view_blogger"),
+    re_path(r"^bloggers/([\w\d\-]+)/feed/$", views.author_feed, name="author_feed"),
+    path("api/posts/", api.posts, name="api_posts"),
+    re_path(r"^api/posts/([\w\d\-]+)/$", api.post, name="api_post"),
+    re_path(r"^api/posts/([\w\d\-]+)/comments/$", api.comments, name="api_comments"),
+    re_path(r"^api/bloggers/([\w\d\-]+)/$", api.author, name="api_author"),
 ]
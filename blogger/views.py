@@ -1,40 +1,80 @@
-from django.shortcuts import render, redirect, reverse
+from django.shortcuts import get_object_or_404, render, redirect, reverse
 from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth import get_user_model
-from django.core.paginator import Paginator
+from django.views.decorators.http import condition
+from blogger import conditional, feeds, permalinks
+from blogger import search as full_text
 from blogger.forms import PostModelForm, CommentModelForm
-from blogger.models import Post, Author
-
-User = get_user_model()
+from blogger.models import Post, Author, Comment
+from blogger.page_cache import cache_anonymous_page
+from blogger.pagination import paginate, paginate_comments
+from blogger.routers import read_from_replica, sticky_writes
 
 
+@read_from_replica
+@cache_anonymous_page("feed")
 def index(request):
-    posts = Post.objects.all()
-    paginator = Paginator(posts, 10)
-
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(request, Post.objects.for_listing())
     return render(request, "blogger/index.html", {"page_obj": page_obj})
 
 
+@read_from_replica
+@condition(
+    etag_func=conditional.feed_etag, last_modified_func=conditional.feed_last_modified
+)
+def feed(request):
+    return feeds.feed_response(
+        request,
+        title="blogger",
+        link=reverse("blogger:index"),
+        posts=feeds.latest_posts(Post.objects.for_feed()),
+        updated=conditional.feed_last_modified(request),
+    )
+
+
+@read_from_replica
+@condition(
+    etag_func=conditional.feed_etag, last_modified_func=conditional.feed_last_modified
+)
+def author_feed(request, username):
+    author = get_object_or_404(Author, username=username)
+    return feeds.feed_response(
+        request,
+        title=f"{author} - blogger",
+        link=reverse("blogger:view_blogger", args=(username,)),
+        posts=feeds.latest_posts(Post.objects.for_feed(), username),
+        updated=conditional.feed_last_modified(request, username),
+    )
+
+
+@read_from_replica
+def search(request):
+    query = request.GET.get("q", "").strip()
+    results = full_text.search(query, cursor=request.GET.get("after"))
+    return render(request, "blogger/search.html", {"query": query, "results": results})
+
+
+@sticky_writes
 @login_required
 def add(request):
-    author = Author.objects.get(user=request.user)
     if request.method == "POST":
         form = PostModelForm(request.POST)
         if form.is_valid():
-            post = form.save(author=author)
+            post = form.save(author=request.author)
             return redirect(post)
     else:
         form = PostModelForm()
     return render(request, "blogger/add.html", {"form": form})
 
 
+@sticky_writes
 @login_required
 def edit_post(request, title):
-    post = Post.objects.get(title_slug=title)
-    if post.author.user == request.user:
+    permalink = permalinks.resolve(title)
+    if permalink.user_id == request.user.pk:
+        post = get_object_or_404(
+            Post.objects.select_related("author"), pk=permalink.post_id
+        )
         if request.method == "POST":
             form = PostModelForm(request.POST, instance=post)
             if form.is_valid():
@@ -47,18 +87,46 @@ def edit_post(request, title):
         return render(request, "blogger/add.html")
 
 
+@read_from_replica
+@condition(
+    etag_func=conditional.post_etag, last_modified_func=conditional.post_last_modified
+)
+@cache_anonymous_page("post")
 def view_post(request, title):
-    post = Post.objects.get(title_slug=title)
-    comments = post.comment_set.all()
+    post = get_object_or_404(Post.objects.select_related("author"), title_slug=title)
+    comments = paginate_comments(request, post.comment_set.select_related("author"))
     return render(
         request, "blogger/view_post.html", {"post": post, "comments": comments}
     )
 
 
+@read_from_replica
+@condition(
+    etag_func=conditional.post_etag, last_modified_func=conditional.post_last_modified
+)
+@cache_anonymous_page("post")
+def comment_list(request, title):
+    permalink = permalinks.resolve(title)
+    comments = paginate_comments(
+        request,
+        Comment.objects.filter(post_id=permalink.post_id).select_related("author"),
+    )
+    return render(
+        request,
+        "blogger/comment_list.html",
+        {"title_slug": title, "comments": comments},
+    )
+
+
+@sticky_writes
 @login_required
 def delete_post(request, title):
-    post = Post.objects.get(title_slug=title)
-    if post.author.user == request.user:
+    permalink = permalinks.resolve(title)
+    if permalink.user_id == request.user.pk:
+        post = get_object_or_404(
+            Post.objects.select_related("author").defer("content"),
+            pk=permalink.post_id,
+        )
         if request.method == "POST":
             post.delete()
             return redirect(reverse("blogger:index"))
@@ -67,26 +135,39 @@ def delete_post(request, title):
         return render(request, "blogger/delete_post.html")
 
 
+@sticky_writes
 @login_required
 def add_comment(request, title):
     if request.method == "POST":
-        post = Post.objects.get(title_slug=title)
-        author = Author.objects.get(user=request.user)
+        permalink = permalinks.resolve(title)
+        post = get_object_or_404(
+            Post.objects.select_related("author").defer("content"),
+            pk=permalink.post_id,
+        )
         form = CommentModelForm(request.POST)
         if form.is_valid():
-            form.save(post=post, author=author)
+            if form.save(post=post, author=request.author) is None:
+                # Accepted but not committed yet; a resubmit would duplicate it.
+                return render(
+                    request, "blogger/add_comment.html", {"post": post}, status=202
+                )
             return redirect(post)
     else:
         form = CommentModelForm()
     return render(request, "blogger/add_comment.html", {"form": form})
 
 
+@read_from_replica
+@condition(
+    etag_func=conditional.author_etag,
+    last_modified_func=conditional.author_last_modified,
+)
+@cache_anonymous_page("author")
 def view_blogger(request, username):
     try:
-        user = User.objects.get(username=username)
-        author = Author.objects.get(user=user)
-        posts = Post.objects.filter(author=author)
-    except User.DoesNotExist:
+        author = Author.objects.get(username=username)
+        posts = paginate(request, Post.objects.for_listing().filter(author=author))
+    except Author.DoesNotExist:
         author = None
         posts = None
     return render(
@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import time
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+
+logger = logging.getLogger("blogger.performance")
+
+PREFIXES = ("blogger/", "registration/")
+
+
+def _backends():
+    return [
+        backend for backend in engines.all() if isinstance(backend, DjangoTemplates)
+    ]
+
+
+def template_names(prefixes=PREFIXES):
+    """Every template under ``prefixes`` in the project and app template dirs."""
+    directories = list(get_app_template_dirs("templates"))
+    for backend in _backends():
+        directories.extend(backend.dirs)
+    names = set()
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for file in files:
+                path = os.path.join(root, file)
+                name = os.path.relpath(path, directory).replace(os.sep, "/")
+                if name.startswith(prefixes) and name.endswith(".html"):
+                    names.add(name)
+    return sorted(names)
+
+
+def compile_templates(names):
+    for backend in _backends():
+        for name in names:
+            backend.get_template(name)
+
+
+def render_forms():
+    # The crispy filter loads the templates of each field type the first
+    # time it renders one; the forms of the site cover the ones in use.
+    from django.contrib.auth.forms import AuthenticationForm
+    from accounts.forms import CustomUserCreationForm
+    from blogger.forms import CommentModelForm, PostModelForm
+
+    forms = [
+        AuthenticationForm(),
+        CustomUserCreationForm(),
+        CommentModelForm(),
+        PostModelForm(),
+    ]
+    for backend in _backends():
+        template = backend.from_string("{% load crispy_forms_tags %}{{ form|crispy }}")
+        for form in forms:
+            template.render({"form": form})
+
+
+def populate_urls():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for _, namespace in resolver.namespace_dict.values():
+        namespace.reverse_dict
+
+
+def run():
+    """
+    Do the work the first requests of a process would otherwise pay for:
+    compile the blogger/ and registration/ templates into the cached
+    loader, render the crispy form templates once and build the URL
+    resolvers. Run it before the server forks its workers, and they start
+    with it done and share the memory it used.
+    """
+    start = time.perf_counter()
+    names = template_names()
+    compile_templates(names)
+    render_forms()
+    populate_urls()
+    logger.info(
+        json.dumps(
+            {
+                "warmup_ms": round((time.perf_counter() - start) * 1000, 3),
+                "templates": len(names),
+            }
+        )
+    )
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogger_app.settings')
 
 application = get_asgi_application()
+
+if settings.BLOGGER_TEMPLATE_MODE == 'production':
+    from blogger import warmup
+
+    warmup.run()
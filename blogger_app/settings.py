@@ -38,7 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "blogger",
+    "blogger.apps.BloggerConfig",
     "accounts",
     "crispy_forms",
 ]
@@ -46,11 +46,13 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "accounts.User"
 
 MIDDLEWARE = [
+    "blogger.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "blogger.middleware.CurrentAuthorMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -59,7 +61,7 @@ ROOT_URLCONF = "blogger_app.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "blogger.templating.TimedDjangoTemplates",
         "DIRS": [os.path.join(BASE_DIR, "templates")],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -128,3 +130,129 @@ LOGOUT_REDIRECT_URL = "/blogger/"
 # https://docs.djangoproject.com/en/3.1/howto/static-files/
 
 STATIC_URL = "/static/"
+
+
+# Blogger
+
+# "numbered" pages listings with ?page= (one COUNT(*) per request, fine for
+# small installs); "cursor" uses opaque ?after= tokens and keyset queries.
+BLOGGER_PAGINATION = "numbered"
+
+# Rendered post bodies are cached per (post id, modified) in this cache alias.
+BLOGGER_RENDER_CACHE_ALIAS = "default"
+BLOGGER_RENDER_CACHE_TIMEOUT = 60 * 60 * 24
+# Count hits and misses in the same cache, for render_cache_stats. Costs two
+# more cache round trips per render. The counts cover all workers only if
+# the cache is shared (memcached, redis); with the default local-memory
+# cache each process keeps its own.
+BLOGGER_RENDER_CACHE_STATS = False
+
+# Anonymous GETs of the feed, post and profile pages are cached in this alias
+# for this many seconds; 0 disables the page cache.
+BLOGGER_PAGE_CACHE_ALIAS = "default"
+BLOGGER_PAGE_CACHE_TIMEOUT = 300
+
+# Fraction of requests PerformanceMiddleware measures and logs to the
+# "blogger.performance" logger; 0 turns it off.
+BLOGGER_PERFORMANCE_SAMPLE_RATE = 0.05
+
+# "auto" uses the SQLite FTS5 index when it exists, "basic" always falls
+# back to LIKE queries over posts and comments.
+BLOGGER_SEARCH_BACKEND = "auto"
+
+# Serve the feed, post and author pages from blogger.async_views. Only worth
+# it when running under ASGI (blogger_app/asgi.py).
+BLOGGER_ASYNC_VIEWS = False
+
+# Number of newest posts in the Atom and RSS feeds.
+BLOGGER_FEED_LENGTH = 20
+
+# Comments shown per page under a post; further pages are loaded on demand.
+BLOGGER_COMMENTS_PER_PAGE = 50
+
+# "direct" saves each comment in its own transaction. "grouped" hands it to
+# a writer thread that commits the comments arriving within
+# BLOGGER_COMMENT_INGEST_DELAY seconds together, up to
+# BLOGGER_COMMENT_INGEST_BATCH_SIZE per transaction; the request still
+# waits (at most BLOGGER_COMMENT_INGEST_TIMEOUT seconds) for the commit.
+BLOGGER_COMMENT_INGEST = "direct"
+BLOGGER_COMMENT_INGEST_DELAY = 0.01
+BLOGGER_COMMENT_INGEST_BATCH_SIZE = 100
+BLOGGER_COMMENT_INGEST_TIMEOUT = 10
+
+# PRAGMAs applied to every SQLite connection (see blogger/sqlite.py):
+# "production" turns on WAL and tuned caches and keeps connections open
+# between requests; "default" leaves SQLite as it comes and reconnects on
+# every request. WAL mode stays on in the database file once it has been
+# opened with "production", so development uses "default" unless asked.
+BLOGGER_SQLITE_PROFILE = os.environ.get(
+    "BLOGGER_SQLITE_PROFILE", "default" if DEBUG else "production"
+)
+DATABASES["default"]["CONN_MAX_AGE"] = (
+    600 if BLOGGER_SQLITE_PROFILE == "production" else 0
+)
+
+# Session storage: "db" reads the session row on every logged-in request;
+# "cached_db" serves it from the default cache and only writes through to
+# the database, and needs a cache shared by every process (memcached,
+# redis), or a logout in one process goes unnoticed in the others;
+# "signed_cookies" keeps the session in the browser, so a logout can't
+# revoke copies of the cookie taken before it.
+BLOGGER_SESSIONS = os.environ.get("BLOGGER_SESSIONS", "db")
+SESSION_ENGINE = f"django.contrib.sessions.backends.{BLOGGER_SESSIONS}"
+
+# GET requests to the read-only views read blogger's tables from one of
+# these aliases (see blogger/routers.py); writes, sessions and users always
+# use "default". A client that has just posted a form reads from "default"
+# for BLOGGER_REPLICA_STICKY_SECONDS, so it sees its own changes.
+# BLOGGER_LOCAL_REPLICA=1 adds a SQLite copy of the database, refreshed by
+# the sync_replicas command.
+DATABASE_ROUTERS = ["blogger.routers.ReplicaRouter"]
+BLOGGER_READ_DATABASES = []
+BLOGGER_REPLICA_STICKY_SECONDS = 30
+if os.environ.get("BLOGGER_LOCAL_REPLICA"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "TEST": {"MIRROR": "default"},
+    }
+    BLOGGER_READ_DATABASES = ["replica"]
+
+# "production" compiles every template once per process (the cached
+# loader) and, from blogger_app/wsgi.py and asgi.py, compiles them all
+# before the first request (blogger/warmup.py); "debug" reads templates
+# from disk on every render, so edits show up without a restart.
+BLOGGER_TEMPLATE_MODE = os.environ.get(
+    "BLOGGER_TEMPLATE_MODE", "debug" if DEBUG else "production"
+)
+TEMPLATE_SOURCE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = (
+    [("django.template.loaders.cached.Loader", TEMPLATE_SOURCE_LOADERS)]
+    if BLOGGER_TEMPLATE_MODE == "production"
+    else TEMPLATE_SOURCE_LOADERS
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "blogger.performance": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+        # One JSON line per grouped comment transaction: batch size, queue
+        # depth left behind and flush latency.
+        "blogger.ingest": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+    },
+}
@@ -3,3 +3,10 @@ from blogger_app.settings import *
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
+
+BLOGGER_PAGE_CACHE_TIMEOUT = 0
+BLOGGER_PERFORMANCE_SAMPLE_RATE = 0
+
+# Not used unless a test turns on BLOGGER_READ_DATABASES; mirrors "default"
+# so routed reads see the same test database.
+DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
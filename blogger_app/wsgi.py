@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/3.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogger_app.settings')
 
 application = get_wsgi_application()
+
+if settings.BLOGGER_TEMPLATE_MODE == 'production':
+    from blogger import warmup
+
+    warmup.run()